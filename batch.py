@@ -0,0 +1,139 @@
+""" Import Steam libraries of many users in one run
+
+Store info is fetched once for the union of all libraries and shared by every user import.
+Accounts file is a json list, tokens default to NOTION_TOKEN and STEAM_TOKEN variables:
+
+[
+    {"steam_user": "solesensei", "notion_token": "...", "notion_page": "https://www.notion.so/..."},
+    {"steam_user": "76561197960287930", "notion_token": "..."}
+]
+
+Users without `notion_page` get a new game list page, others are synced with the given page.
+"""
+import argparse
+import os
+import sys
+import typing as tp
+
+from ngl import cli
+from ngl.client import NotionGameList
+from ngl.core import http as transport
+from ngl.errors import ServiceError
+from ngl.games.steam import SteamGamesLibrary, SteamStoreApi
+from ngl.utils import echo, load_from_file, soft_exit
+
+
+# ----------- Variables -----------
+NOTION_TOKEN = os.getenv("NOTION_TOKEN")  # Notion cookies 'token_v2'
+STEAM_TOKEN = os.getenv("STEAM_TOKEN")    # https://steamcommunity.com/dev/apikey
+DEBUG = os.getenv("DEBUG", "0") == "1"
+# ---------------------------------
+
+
+class Account(tp.NamedTuple):
+    steam_user: str
+    notion_token: str
+    steam_token: str
+    notion_page: tp.Optional[str] = None
+
+
+def load_accounts(filename: str) -> tp.List[Account]:
+    if not os.path.exists(filename):
+        raise ServiceError(msg=f"accounts file {filename} not found")
+    accounts = []
+    for i, item in enumerate(load_from_file(filename)):
+        account = Account(
+            steam_user=str(item.get("steam_user") or ""),
+            notion_token=item.get("notion_token") or NOTION_TOKEN,
+            steam_token=item.get("steam_token") or STEAM_TOKEN,
+            notion_page=item.get("notion_page"),
+        )
+        if not account.steam_user or not account.notion_token or not account.steam_token:
+            raise ServiceError(msg=f"account #{i + 1} needs steam_user, notion_token and steam_token")
+        accounts.append(account)
+    if not accounts:
+        raise ServiceError(msg=f"no accounts in {filename}")
+    return accounts
+
+
+def import_account(account: Account, steam: SteamGamesLibrary, args) -> tp.Tuple[int, int]:
+    """ Import one user library to Notion, returns number of imported and total games """
+    ngl = NotionGameList.login(token_v2=account.notion_token)
+    games = steam.iter_games(skip_non_steam=args.skip_non_steam, skip_free_games=args.skip_free_steam, library_only=args.use_only_library)
+    if account.notion_page:
+        game_list = list(games)
+        game_page = ngl.connect_page(account.notion_page)
+        errors = ngl.sync_game_list(game_list, game_page, archive_missing=args.archive_missing, owned_ids=steam.owned_game_ids(), use_bg_as_cover=args.store_bg_cover, batch_size=args.notion_batch_size, workers=args.notion_workers)
+        total = len(game_list)
+    else:
+        game_page = ngl.create_game_page(sort_by_name=not args.unsorted)
+        total, errors = ngl.import_game_stream(games, game_page, use_bg_as_cover=args.store_bg_cover, batch_size=args.notion_batch_size, workers=args.notion_workers)
+    for error in sorted(errors, key=lambda x: x.name):
+        echo.r(f"- {error.name}")
+    return total - len(errors), total
+
+
+profile, store = None, None
+failed = []
+
+try:
+    parser = argparse.ArgumentParser(description="Import Steam libraries of many users, store info is fetched once for all of them")
+    parser.add_argument("accounts", help="Json file with list of accounts: steam_user, notion_token, steam_token, notion_page")
+    parser.add_argument("--archive-missing", help="Archive games that are no longer in the library (accounts with notion_page)", action="store_true")
+    cli.add_import_arguments(parser)
+    args = parser.parse_args()
+    profile = args.profile
+    selection = cli.game_selection(args)
+
+    accounts = load_accounts(args.accounts)
+    transport.configure(http2=args.http2)
+
+    # one store client and games cache for all users, games owned by several users are resolved once
+    store = SteamStoreApi(workers=args.steam_workers)
+    cache = SteamGamesLibrary.open_cache()
+    catalog = cli.app_catalog(args)
+    libraries = {}
+    echo.y(f"Getting Steam libraries of {len(accounts)} users...")
+    for account in accounts:
+        steam = SteamGamesLibrary(api_key=account.steam_token, user_id=account.steam_user, store=store, cache=cache, catalog=catalog, selection=selection)
+        try:
+            libraries[account] = (steam, steam.missing_game_ids())
+        except ServiceError as err:
+            echo(err)
+            failed.append(account.steam_user)
+
+    if not args.use_only_library:
+        game_ids = set().union(*(ids for _, ids in libraries.values()))
+        echo.y(f"Fetching Steam store info of {len(game_ids)} games missing in cache...")
+        store.fetch_many(game_ids)
+
+    for account, (steam, _) in libraries.items():
+        echo.y(f"Importing games of {account.steam_user} to Notion...")
+        try:
+            imported, total = import_account(account, steam, args)
+        except ServiceError as err:
+            echo(err)
+            failed.append(account.steam_user)
+            continue
+        echo.g(f"Imported {account.steam_user}: {imported}/{total}")
+        if imported == 0:
+            failed.append(account.steam_user)
+
+    if failed:
+        raise ServiceError(msg="import failed for: " + ", ".join(failed))
+
+except ServiceError as err:
+    echo(err)
+    if DEBUG:
+        raise err
+    soft_exit(1)
+except (Exception, KeyboardInterrupt) as err:
+    echo(f"\n{err.__class__.__name__}: {err}", file=sys.stderr)
+    if DEBUG:
+        raise err
+    soft_exit(1)
+finally:
+    cli.report_profile(profile, store)
+
+echo.m("Completed!")
+soft_exit(0)
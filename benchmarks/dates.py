@@ -0,0 +1,58 @@
+""" Release date parsing: strptime over formats vs tokenizer with memoization
+
+python -m benchmarks.dates --count 50000
+"""
+import argparse
+import random
+import time
+from datetime import datetime
+
+from ngl.core.dates import parse_date
+
+FORMATS = (r"%d %b, %Y", r"%b %d, %Y", r"%b %Y", r"%d %b %Y", r"%b %d %Y", r"%Y")
+
+
+def parse_date_strptime(date_str: str):
+    """ Previous NotionGameList._parse_date """
+    for fmt in FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt).date()
+        except ValueError:
+            pass
+    return None
+
+
+def release_dates(count: int) -> list:
+    """ Store-like dates, many games share one date """
+    rnd = random.Random(count)
+    months = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+    shapes = ("{d} {m}, {y}", "{m} {d}, {y}", "{m} {y}", "{y}", "Coming soon")
+    return [
+        rnd.choice(shapes).format(d=rnd.randint(1, 28), m=rnd.choice(months), y=rnd.randint(2000, 2022))
+        for _ in range(count)
+    ]
+
+
+def measure(parse, dates) -> tuple:
+    started = time.perf_counter()
+    parsed = [parse(d) for d in dates]
+    return parsed, time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", help="Number of release dates", type=int, default=50000)
+    args = parser.parse_args()
+
+    dates = release_dates(args.count)
+    expected, elapsed = measure(parse_date_strptime, dates)
+    print(f"        strptime: {elapsed * 1000:7.1f} ms")
+
+    parsed, elapsed = measure(parse_date.__wrapped__, dates)
+    assert parsed == expected
+    print(f"       tokenizer: {elapsed * 1000:7.1f} ms")
+
+    parse_date.cache_clear()
+    parsed, elapsed = measure(parse_date, dates)
+    assert parsed == expected
+    print(f"  tokenizer+memo: {elapsed * 1000:7.1f} ms, {len(set(dates))} unique dates")
@@ -0,0 +1,80 @@
+import json
+import os
+import random
+import typing as tp
+
+
+def appdetails_payload(app_id: int, rnd: tp.Optional[random.Random] = None) -> dict:
+    """ Synthetic full appdetails `data` with roughly the shape and size of a real store answer """
+    rnd = rnd or random.Random(app_id)
+    text = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * rnd.randint(10, 60)
+    media = "https://cdn.akamai.steamstatic.com/steam/apps/{}/{}"
+    return {
+        "type": "game",
+        "name": f"Game {app_id}",
+        "steam_appid": app_id,
+        "required_age": 0,
+        "is_free": rnd.random() < 0.1,
+        "detailed_description": text,
+        "about_the_game": text,
+        "short_description": text[:300],
+        "supported_languages": "English, French, German, Russian",
+        "header_image": media.format(app_id, "header.jpg"),
+        "website": f"https://game{app_id}.example.com",
+        "pc_requirements": {"minimum": text[:500], "recommended": text[:500]},
+        "mac_requirements": [],
+        "linux_requirements": [],
+        "developers": ["Developer"],
+        "publishers": ["Publisher"],
+        "packages": [app_id * 10],
+        "package_groups": [{
+            "name": "default", "title": f"Buy Game {app_id}", "description": "", "selection_text": "Select",
+            "save_text": "", "display_type": 0, "is_recurring_subscription": "false",
+            "subs": [{
+                "packageid": app_id * 10, "percent_savings_text": " ", "percent_savings": 0, "option_text": "$9.99",
+                "option_description": "", "can_get_free_license": "0", "is_free_license": False, "price_in_cents_with_discount": 999,
+            }],
+        }],
+        "platforms": {"windows": True, "mac": False, "linux": False},
+        "categories": [{"id": i, "description": f"Category {i}"} for i in range(rnd.randint(2, 10))],
+        "genres": [{"id": str(i), "description": f"Genre {i}"} for i in range(rnd.randint(1, 4))],
+        "screenshots": [
+            {"id": i, "path_thumbnail": media.format(app_id, f"ss_{i}.600x338.jpg"), "path_full": media.format(app_id, f"ss_{i}.1920x1080.jpg")}
+            for i in range(rnd.randint(5, 20))
+        ],
+        "movies": [
+            {
+                "id": i, "name": f"Trailer {i}", "thumbnail": media.format(app_id, f"movie_{i}.jpg"),
+                "webm": {"480": media.format(app_id, f"movie_{i}_480.webm"), "max": media.format(app_id, f"movie_{i}_max.webm")},
+                "mp4": {"480": media.format(app_id, f"movie_{i}_480.mp4"), "max": media.format(app_id, f"movie_{i}_max.mp4")},
+                "highlight": True,
+            }
+            for i in range(rnd.randint(0, 4))
+        ],
+        "recommendations": {"total": rnd.randint(0, 100000)},
+        "achievements": {"total": 20, "highlighted": [{"name": f"Achievement {i}", "path": media.format(app_id, f"a{i}.jpg")} for i in range(10)]},
+        "release_date": {"coming_soon": False, "date": rnd.choice(["1 Nov, 2000", "Nov 1, 2000", "Nov 2000", "2000"])},
+        "support_info": {"url": "", "email": "support@example.com"},
+        "background": media.format(app_id, "page_bg_generated_v6b.jpg"),
+        "content_descriptors": {"ids": [], "notes": None},
+        "price_overview": {
+            "currency": "USD", "initial": 999, "final": 999, "discount_percent": 0,
+            "initial_formatted": "", "final_formatted": "$9.99",
+        },
+    }
+
+
+def load_appdetails(count: int, filename: tp.Optional[str] = None) -> tp.List[dict]:
+    """ Saved appdetails payloads from store cache file, padded with synthetic ones up to `count` """
+    payloads = []
+    if filename and os.path.exists(filename):
+        with open(filename, "r", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                if len(record) == 3 and record[2]["v"].get("success"):
+                    payloads.append(record[2]["v"]["data"])
+                if len(payloads) == count:
+                    break
+    rnd = random.Random(count)
+    payloads += [appdetails_payload(app_id, rnd) for app_id in range(len(payloads), count)]
+    return payloads
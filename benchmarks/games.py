@@ -0,0 +1,60 @@
+""" Game cache loading into GameInfo objects vs GameCollection columns
+
+python -m benchmarks.games --count 50000
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from ngl.games.base import GameCollection, GameInfo
+
+
+def cache_records(count: int) -> list:
+    rnd = random.Random(count)
+    return [
+        GameInfo(
+            id=str(app_id),
+            name=f"Game {app_id}",
+            platforms=["steam"],
+            release_date=rnd.choice(["1 Nov, 2000", "Nov 1, 2000", "2010"]),
+            playtime=rnd.choice(["never", "15 minutes", "2 hours"]),
+            playtime_minutes=rnd.randint(0, 10000),
+            logo_uri=f"https://cdn.akamai.steamstatic.com/steam/apps/{app_id}/header.jpg",
+            bg_uri=f"https://steamcdn-a.akamaihd.net/steam/apps/{app_id}/page_bg_generated.jpg",
+            icon_uri=f"http://media.steampowered.com/steamcommunity/public/images/apps/{app_id}/{rnd.getrandbits(160):040x}.jpg",
+            free=rnd.random() < 0.1,
+        ).to_dict()
+        for app_id in range(count)
+    ]
+
+
+def measure(load, records) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    games = load(records)
+    elapsed = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return games, elapsed, size
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", help="Number of cached games", type=int, default=50000)
+    args = parser.parse_args()
+
+    records = cache_records(args.count)
+    games, elapsed, size = measure(lambda rs: [GameInfo(**r) for r in rs], records)
+    started = time.perf_counter()
+    [g for g in games if not g.free and g.playtime_minutes >= 600]
+    filtered = time.perf_counter() - started
+    print(f"   GameInfo list: load {elapsed * 1000:7.1f} ms, {size / 1024:8.1f} KiB, filter {filtered * 1000:6.1f} ms")
+
+    collection, elapsed, size = measure(GameCollection.from_records, records)
+    started = time.perf_counter()
+    collection.where(free=False, min_playtime=600)
+    filtered = time.perf_counter() - started
+    print(f"  GameCollection: load {elapsed * 1000:7.1f} ms, {size / 1024:8.1f} KiB, filter {filtered * 1000:6.1f} ms")
@@ -0,0 +1,52 @@
+""" Store models decode time and memory
+
+python -m benchmarks.models --count 3000 --fixture store_cache.jsonl
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from benchmarks.fixtures import load_appdetails
+from ngl.models.steam import SteamStoreApp
+
+
+def read_used_fields(app: SteamStoreApp):
+    # fields read by SteamGamesLibrary
+    return app.header_image, app.release_date.date, app.is_free
+
+
+def read_all_fields(app: SteamStoreApp):
+    # same work as eager loading of every nested model
+    for name in SteamStoreApp.NESTED:
+        getattr(app, name)
+    for group in app.package_groups:
+        group.subs
+    if app.achievements is not None:
+        app.achievements.highlighted
+
+
+def measure(payloads, read) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    apps = [SteamStoreApp.load(payload) for payload in payloads]
+    for app in apps:
+        read(app)
+    elapsed = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, size
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", help="Number of appdetails payloads", type=int, default=3000)
+    parser.add_argument("--fixture", help="Store cache file with saved appdetails payloads", default="store_cache.jsonl")
+    args = parser.parse_args()
+
+    payloads = load_appdetails(args.count, args.fixture)
+    print(f"Payloads: {len(payloads)}")
+    for title, read in (("used fields", read_used_fields), ("all fields", read_all_fields)):
+        elapsed, size = measure(payloads, read)
+        print(f"{title:>12}: {elapsed * 1000:8.1f} ms, {size / 1024:8.1f} KiB kept by models")
@@ -0,0 +1,147 @@
+""" Whole import against local stand-in services: Steam library fetch and Notion import
+
+python -m benchmarks.pipeline --scenario all --latency 0.02 --store-rate 200/5
+
+Scenarios:
+    cold   empty caches, `--count` games
+    warm   caches filled by a previous untimed run, `--count` games
+    large  5000 games library, cold and then warm
+    sync   `--count` games imported and then synced with the same library, nothing must be created
+"""
+import argparse
+import os
+import tempfile
+import time
+import typing as tp
+from contextlib import contextmanager
+
+import notion.client
+
+from benchmarks.servers import NotionRecords, StandInServer
+from ngl.client import NotionGameList, NotionWriter
+from ngl.core.ratelimit import TokenBucket
+from ngl.games.steam import SteamGamesLibrary
+
+STEAM_ID = "76561197960287930"  # numeric id does not need steamapi to resolve vanity url
+LARGE_LIBRARY = 5000
+NO_RATE_LIMIT = (10 ** 6, 1.0)  # requests per seconds
+
+
+@contextmanager
+def working_dir(path: str):
+    """ Cache files are created in the current directory """
+    cwd = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(cwd)
+
+
+def steam_library(server: StandInServer, args) -> SteamGamesLibrary:
+    steam = SteamGamesLibrary(api_key="bench", user_id=STEAM_ID, store_workers=args.steam_workers)
+    steam.OWNED_GAMES_API = server.url + "/IPlayerService/GetOwnedGames/v1/"
+    steam.BG_IMAGE_HOST = server.url + "/steam/apps/{game_id}/{bg}.jpg"
+    steam.store.API_HOST = server.url + "/api/appdetails"
+    # client follows the same limit as stand-in store, real store limit would make benchmark take hours
+    steam.store.limiter = TokenBucket.for_limit(*(args.store_rate or NO_RATE_LIMIT), capacity=steam.store.RATE_BURST)
+    return steam
+
+
+def notion_game_list(server: StandInServer) -> NotionGameList:
+    notion.client.API_BASE_URL = NotionWriter.API_URL = server.url + "/api/v3/"
+    return NotionGameList(token_v2="bench")
+
+
+def run(server: StandInServer, args) -> tp.Dict[str, float]:
+    """ Fetch library and import it to a new Notion page, returns seconds spent on each step """
+    started = time.perf_counter()
+    games = list(steam_library(server, args).iter_games())
+    steam_elapsed = time.perf_counter() - started
+
+    ngl = notion_game_list(server)
+    game_page = ngl.client.get_block(server.notion.page_id)
+    started = time.perf_counter()
+    errors = ngl.import_game_list(games, game_page, batch_size=args.notion_batch_size, workers=args.notion_workers)
+    notion_elapsed = time.perf_counter() - started
+    assert not errors, f"{len(errors)} games were not imported"
+    return dict(games=len(games), steam=steam_elapsed, notion=notion_elapsed)
+
+
+def sync(server: StandInServer, args) -> tp.Dict[str, float]:
+    """ Import library and sync the page with it again, returns seconds spent on the sync.
+    Games not in store are skipped on sync, they are still owned and must not be archived.
+    """
+    run(server, args)
+    steam = steam_library(server, args)
+    games = list(steam.iter_games(skip_non_steam=True))
+    ngl = notion_game_list(server)
+    game_page = ngl.connect_page(server.notion.page_id)
+    started = time.perf_counter()
+    errors = ngl.sync_game_list(games, game_page, archive_missing=True, owned_ids=steam.owned_game_ids(), batch_size=args.notion_batch_size, workers=args.notion_workers)
+    notion_elapsed = time.perf_counter() - started
+    assert not errors, f"{len(errors)} games were not synced"
+    assert ngl.sync_stats["created"] == 0, f"sync created {ngl.sync_stats['created']} games already in the page"
+    assert ngl.sync_stats["unchanged"] == len(games), f"sync changed {len(games) - ngl.sync_stats['unchanged']} games"
+    assert ngl.sync_stats["archived"] == 0, f"sync archived {ngl.sync_stats['archived']} owned games"
+    return dict(games=len(games), steam=0.0, notion=notion_elapsed)
+
+
+def report(name: str, result: tp.Dict[str, float], server: StandInServer):
+    games = result["games"]
+    print(
+        f"\r{name:<12} {games:>5} games | "
+        f"steam {result['steam']:7.2f}s {games / result['steam'] if result['steam'] else 0:8.1f} games/s | "
+        f"notion {result['notion']:7.2f}s {games / result['notion']:8.1f} games/s"
+    )
+    print("             requests: " + ", ".join(f"{k}: {v}" for k, v in sorted(server.requests.items())))
+    server.requests.clear()
+
+
+def notion_records() -> NotionRecords:
+    return NotionRecords(NotionGameList._game_list_schema(), views={"table": {}, "gallery": {}, "calendar": {}})
+
+
+def scenario(name: str, count: int, warm_up: bool, args):
+    with tempfile.TemporaryDirectory() as cache_dir, working_dir(cache_dir), \
+            StandInServer(count, notion_records(), latency=args.latency, store_rate=args.store_rate) as server:
+        if warm_up:
+            run(server, args)
+            # only Steam side is cached, games are imported into a new page again
+            server.notion = notion_records()
+            server.requests.clear()
+        report(name, run(server, args), server)
+
+
+def sync_scenario(count: int, args):
+    with tempfile.TemporaryDirectory() as cache_dir, working_dir(cache_dir), \
+            StandInServer(count, notion_records(), latency=args.latency, store_rate=args.store_rate) as server:
+        result = sync(server, args)
+        report("sync", result, server)
+
+
+def rate(value: str) -> tp.Tuple[int, float]:
+    requests, period = value.split("/")
+    return int(requests), float(period)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenario", choices=("cold", "warm", "large", "sync", "all"), default="all")
+    parser.add_argument("--count", help="Number of games in cold and warm scenarios", type=int, default=500)
+    parser.add_argument("--latency", help="Average seconds every stand-in request takes", type=float, default=0.02)
+    parser.add_argument("--store-rate", help="Store rate limit as requests/seconds, e.g. 200/5 (default: no limit)", type=rate)
+    parser.add_argument("--steam-workers", type=int, default=4)
+    parser.add_argument("--notion-batch-size", type=int, default=50)
+    parser.add_argument("--notion-workers", type=int, default=4)
+    args = parser.parse_args()
+
+    if args.scenario in ("cold", "all"):
+        scenario("cold", args.count, warm_up=False, args=args)
+    if args.scenario in ("warm", "all"):
+        scenario("warm", args.count, warm_up=True, args=args)
+    if args.scenario in ("sync", "all"):
+        sync_scenario(args.count, args)
+    if args.scenario in ("large", "all"):
+        scenario("large cold", LARGE_LIBRARY, warm_up=False, args=args)
+        scenario("large warm", LARGE_LIBRARY, warm_up=True, args=args)
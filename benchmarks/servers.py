@@ -0,0 +1,225 @@
+""" Local stand-in for Steam Store, Steam Web API, Steam CDN and Notion API
+
+One threaded HTTP server answers all endpoints used by the import with synthetic data,
+every request waits `latency` seconds and Store requests over `store_rate` get 429 like the real Store does.
+"""
+import json
+import random
+import threading
+import time
+import typing as tp
+import uuid
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.fixtures import appdetails_payload
+
+NOT_IN_STORE_EVERY = 25  # every n-th app is delisted from store
+
+
+def app_id(index: int) -> int:
+    return 10 * (index + 1)
+
+
+def owned_games(count: int) -> tp.List[dict]:
+    rnd = random.Random(count)
+    return [
+        {
+            "appid": app_id(i),
+            "name": f"Game {i:05d}",
+            "playtime_forever": rnd.choice([0, rnd.randint(1, 100000)]),
+            "playtime_2weeks": rnd.choice([0, 0, 0, rnd.randint(1, 600)]),
+            "rtime_last_played": rnd.randint(1300000000, 1700000000),
+            "img_icon_url": f"{rnd.getrandbits(160):040x}",
+            "img_logo_url": f"{rnd.getrandbits(160):040x}",
+        }
+        for i in range(count)
+    ]
+
+
+class NotionRecords:
+    """ In-memory Notion record tables with one generated game list page """
+
+    def __init__(self, schema: dict, views: tp.Dict[str, dict]):
+        self.user_id, self.space_id = str(uuid.uuid4()), str(uuid.uuid4())
+        self.page_id, self.collection_id = str(uuid.uuid4()), str(uuid.uuid4())
+        view_ids = {name: str(uuid.uuid4()) for name in views}
+        self.tables = {
+            "notion_user": {self.user_id: {"id": self.user_id, "email": "bench@example.com"}},
+            "user_root": {self.user_id: {"id": self.user_id, "space_view_pointers": [{"spaceId": self.space_id}]}},
+            "space": {self.space_id: {"id": self.space_id, "name": "bench"}},
+            "block": {self.page_id: {
+                "id": self.page_id, "type": "collection_view_page", "alive": True, "version": 1,
+                "collection_id": self.collection_id, "view_ids": list(view_ids.values()),
+                "parent_id": self.space_id, "parent_table": "space", "space_id": self.space_id,
+            }},
+            "collection": {self.collection_id: {
+                "id": self.collection_id, "name": [["Games"]], "schema": schema, "alive": True, "version": 1,
+                "parent_id": self.page_id, "parent_table": "block",
+            }},
+            "collection_view": {
+                view_id: dict(views[name], id=view_id, type=name, alive=True, version=1, parent_id=self.page_id, parent_table="block", page_sort=[])
+                for name, view_id in view_ids.items()
+            },
+        }
+        self._lock = threading.Lock()
+
+    def record_map(self, pointers: tp.Iterable[tp.Tuple[str, str]]) -> dict:
+        with self._lock:
+            record_map = {}
+            for table, id_ in pointers:
+                value = self.tables.get(table, {}).get(id_)
+                if value is not None:
+                    record_map.setdefault(table, {})[id_] = {"role": "editor", "value": value}
+            return record_map
+
+    def rows(self, collection_id: str) -> tp.List[dict]:
+        with self._lock:
+            return [
+                block for block in self.tables["block"].values()
+                if block.get("parent_table") == "collection" and block.get("parent_id") == collection_id and block.get("alive", True)
+            ]
+
+    def apply(self, operations: tp.List[dict]):
+        """ Apply set, update and listAfter operations, other commands are accepted and ignored """
+        with self._lock:
+            for op in operations:
+                table = self.tables.setdefault(op["table"], {})
+                if not op["path"]:
+                    if op["command"] == "set":
+                        table[op["id"]] = dict(op["args"])
+                    elif op["command"] == "update":
+                        table.setdefault(op["id"], {}).update(op["args"])
+                    continue
+                target = table.setdefault(op["id"], {"id": op["id"]})
+                *path, key = op["path"]
+                for name in path:
+                    target = target.setdefault(name, {})
+                if op["command"] == "set":
+                    target[key] = op["args"]
+                elif op["command"] == "update":
+                    target.setdefault(key, {}).update(op["args"])
+                elif op["command"] == "listAfter":
+                    target.setdefault(key, []).append(op["args"]["id"])
+
+
+class StandInServer:
+    """ Stand-in services on `http://127.0.0.1:{port}` """
+
+    def __init__(self, games: int, notion: NotionRecords, latency: float = 0.0, store_rate: tp.Optional[tp.Tuple[int, float]] = None):
+        self.games = owned_games(games)
+        self.notion = notion
+        self.latency = latency
+        self.store_rate = store_rate
+        self.requests = Counter()
+        self._store_requests = deque()  # type: tp.Deque[float]
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._httpd.server_port}"
+
+    def __enter__(self):
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, code: int, body: tp.Any = None):
+                data = json.dumps(body).encode() if body is not None else b""
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(data)
+
+            def _route(self) -> tp.Tuple[str, int, tp.Any]:
+                """ Returns endpoint name, status code and json body """
+                url = urlsplit(self.path)
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                if self.command == "POST":
+                    endpoint = url.path.rsplit("/", 1)[-1]
+                    body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                    return (f"notion {endpoint}", *server.notion_api(endpoint, body))
+                if url.path == "/api/appdetails":
+                    return ("store appdetails", *server.appdetails(params["appids"].split(",")))
+                if url.path.startswith("/IPlayerService/GetOwnedGames"):
+                    return "steam GetOwnedGames", 200, {"response": {"game_count": len(server.games), "games": server.games}}
+                if url.path.startswith("/steam/apps/"):
+                    return f"cdn {self.command}", server.image(url.path), None
+                return "unknown", 404, None
+
+            def _handle(self):
+                if server.latency:
+                    time.sleep(server.latency * random.uniform(0.5, 1.5))
+                endpoint, code, body = self._route()
+                with server._lock:
+                    server.requests[endpoint if code != 429 else endpoint + " 429"] += 1
+                self._reply(code, body)
+
+            do_GET = do_HEAD = do_POST = _handle
+
+        return Handler
+
+    def appdetails(self, app_ids: tp.List[str]) -> tp.Tuple[int, tp.Any]:
+        if self.store_rate is not None:
+            limit, period = self.store_rate
+            with self._lock:
+                now = time.monotonic()
+                while self._store_requests and self._store_requests[0] <= now - period:
+                    self._store_requests.popleft()
+                if len(self._store_requests) >= limit:
+                    return 429, None
+                self._store_requests.append(now)
+        return 200, {
+            id_: {"success": True, "data": appdetails_payload(int(id_))} if int(id_) % NOT_IN_STORE_EVERY else {"success": False}
+            for id_ in app_ids
+        }
+
+    @staticmethod
+    def image(path: str) -> int:
+        # third of games have page background, third have generated one only, others have none
+        id_ = int(path.split("/")[3])
+        if "page.bg" in path:
+            return 200 if id_ % 3 == 1 else 404
+        return 200 if id_ % 3 != 0 else 404
+
+    def notion_api(self, endpoint: str, body: dict) -> tp.Tuple[int, tp.Any]:
+        notion = self.notion
+        if endpoint == "loadUserContent":
+            return 200, {"recordMap": notion.record_map([("notion_user", notion.user_id), ("user_root", notion.user_id), ("space", notion.space_id)])}
+        if endpoint == "getPublicSpaceData":
+            return 200, {"results": [notion.tables["space"][notion.space_id]]}
+        if endpoint == "syncRecordValues":
+            return 200, {"recordMap": notion.record_map((r["pointer"]["table"], r["pointer"]["id"]) for r in body["requests"])}
+        if endpoint == "loadPageChunk":
+            return 200, {"recordMap": notion.record_map([("block", body["pageId"])]), "cursor": {"stack": []}}
+        if endpoint == "queryCollection":
+            # like the real API, results are cut at the reducer limit and there is no offset
+            rows = notion.rows(body["source"]["id"])
+            limit = body["loader"]["reducers"]["collection_group_results"]["limit"]
+            block_ids = [row["id"] for row in rows[:limit]]
+            return 200, {
+                "result": {
+                    "type": "reducer",
+                    "reducerResults": {"collection_group_results": {"type": "results", "blockIds": block_ids, "hasMore": len(rows) > limit}},
+                    "sizeHint": len(rows),
+                },
+                "recordMap": notion.record_map(("block", id_) for id_ in block_ids),
+            }
+        if endpoint == "submitTransaction":
+            notion.apply(body["operations"])
+            return 200, {}
+        return 404, None
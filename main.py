@@ -2,7 +2,10 @@ import argparse
 import os
 import sys
 
+from ngl import cli
 from ngl.client import NotionGameList
+from ngl.core import http as transport
+from ngl.core.journal import ImportJournal
 from ngl.errors import ServiceError
 from ngl.games.steam import SteamGamesLibrary
 from ngl.utils import echo, color, soft_exit
@@ -15,49 +18,76 @@ STEAM_USER = os.getenv("STEAM_USER")      # http://steamcommunity.com/id/{STEAM_
 DEBUG = os.getenv("DEBUG", "0") == "1"
 # ---------------------------------
 
+profile, steam = None, None
+
 try:
     parser = argparse.ArgumentParser()
     parser.add_argument("--steam-user", help="Steam user id. http://steamcommunity.com/id/{STEAM_USER}")
-    parser.add_argument("--store-bg-cover", help="Use steam store background as a game cover", action="store_true")
-    parser.add_argument("--skip-non-steam", help="Do not import games that are no longer on Steam store", action="store_true")
-    parser.add_argument("--use-only-library", help="Do not use steam store to fetch game info, fetch everything from library", action="store_true")
-    parser.add_argument("--skip-free-steam", help="Do not import free2play games", action="store_true")
     parser.add_argument("--steam-no-cache", help="Do not use cached fetched games", action="store_true")
+    parser.add_argument("--cached-only", help="Do not request Steam at all, use only cached library and games", action="store_true")
+    parser.add_argument("--notion-page", help="Sync games with existing Notion game list page instead of creating a new one")
+    parser.add_argument("--archive-missing", help="Archive games that are no longer in the library (with --notion-page)", action="store_true")
+    parser.add_argument("--resume", help="Continue interrupted import into the same Notion page", action="store_true")
+    cli.add_import_arguments(parser)
     args = parser.parse_args()
+    profile = args.profile
+    selection = cli.game_selection(args)
 
-    assert not (args.skip_non_steam and args.use_only_library), "You can't use --skip-non-steam and --use-only-library together"
+    assert not (args.cached_only and args.steam_no_cache), "You can't use --cached-only and --steam-no-cache together"
+    assert not (args.archive_missing and not args.notion_page), "You can't use --archive-missing without --notion-page"
+    assert not (args.resume and args.notion_page), "You can't use --resume and --notion-page together"
 
     STEAM_USER = args.steam_user or STEAM_USER
+    transport.configure(http2=args.http2)
 
     echo.y("Logging into Notion...")
     ngl = NotionGameList.login(token_v2=NOTION_TOKEN)
     echo.g("Logged into Notion!")
     echo.y("Logging into Steam...")
-    steam = SteamGamesLibrary.login(api_key=STEAM_TOKEN, user_id=STEAM_USER)
+    catalog = cli.app_catalog(args)
+    steam = SteamGamesLibrary.login(api_key=STEAM_TOKEN, user_id=STEAM_USER, store_workers=args.steam_workers, catalog=catalog, selection=selection)
     echo.g("Logged into Steam!")
 
-    echo.y("Getting Steam library games...")
-    game_list = sorted(
-        [
-            steam.get_game_info(id_) for id_ in steam.get_games_list(
-                skip_non_steam=args.skip_non_steam,
-                skip_free_games=args.skip_free_steam,
-                library_only=args.use_only_library,
-                no_cache=args.steam_no_cache,
-            )
-        ], key=lambda x: x.name,
+    games = steam.iter_games(
+        skip_non_steam=args.skip_non_steam,
+        skip_free_games=args.skip_free_steam,
+        library_only=args.use_only_library,
+        no_cache=args.steam_no_cache,
+        cached_only=args.cached_only,
     )
-    if not game_list:
-        raise ServiceError(msg="no steam games found")
 
-    echo.m(" " * 100 + f"\rGot {len(game_list)} games!")
+    if args.notion_page:
+        echo.y("Getting Steam library games...")
+        game_list = list(games)
+        if not game_list:
+            raise ServiceError(msg="no steam games found")
+        echo.m(f"Got {len(game_list)} games!")
 
-    echo.y("Creating Notion template page...")
-    game_page = ngl.create_game_page()
-    echo.g("Created!")
-    echo.y("Importing steam library games to Notion...")
-    errors = ngl.import_game_list(game_list, game_page, use_bg_as_cover=args.store_bg_cover)
-    imported = len(game_list) - len(errors)
+        echo.y("Connecting to Notion game list page...")
+        game_page = ngl.connect_page(args.notion_page)
+        echo.g("Connected!")
+        echo.y("Syncing steam library games with Notion...")
+        errors = ngl.sync_game_list(game_list, game_page, archive_missing=args.archive_missing, owned_ids=steam.owned_game_ids(cached_only=args.cached_only), use_bg_as_cover=args.store_bg_cover, batch_size=args.notion_batch_size, workers=args.notion_workers)
+        total = len(game_list)
+        echo.m("Created: {created}, updated: {updated}, archived: {archived}, unchanged: {unchanged}".format(**ngl.sync_stats))
+    else:
+        journal = ImportJournal()
+        if args.resume and journal.page_id:
+            echo.y("Connecting to interrupted import Notion page...")
+            game_page = ngl.connect_page(journal.page_id)
+            echo.g("Connected!")
+        else:
+            echo.y("Creating Notion template page...")
+            game_page = ngl.create_game_page(sort_by_name=not args.unsorted)
+            journal.start(game_page.id)
+            echo.g("Created!")
+        echo.y("Importing steam library games to Notion while fetching them...")
+        total, errors = ngl.import_game_stream(games, game_page, use_bg_as_cover=args.store_bg_cover, batch_size=args.notion_batch_size, workers=args.notion_workers, journal=journal)
+        if total == 0:
+            raise ServiceError(msg="no steam games found")
+        if not errors:
+            journal.clear()
+    imported = total - len(errors)
 
     if imported == 0:
         raise ServiceError(msg="no games were imported to Notion")
@@ -66,7 +96,7 @@ try:
         echo.r("Not imported games: ")
         for error in sorted(errors, key=lambda x: x.name):
             echo.r(f"- {error.name}")
-    echo.g(f"Imported: {imported}/{len(game_list)}\n")
+    echo.g(f"Imported: {imported}/{total}\n")
 
 except ServiceError as err:
     echo(err)
@@ -78,6 +108,8 @@ except (Exception, KeyboardInterrupt) as err:
     if DEBUG:
         raise err
     soft_exit(1)
+finally:
+    cli.report_profile(profile, steam.store if steam is not None else None)
 
 echo.m("Completed!")
 soft_exit(0)
@@ -0,0 +1,63 @@
+import argparse
+import typing as tp
+
+from ngl.core import http as transport
+from ngl.core.metrics import metrics
+from ngl.games.catalog import SteamAppCatalog
+from ngl.games.selection import GameSelection, parse_ids
+from ngl.games.steam import SteamStoreApi
+from ngl.utils import echo
+
+
+def add_import_arguments(parser: argparse.ArgumentParser):
+    """ Options shared by single user and batch imports """
+    parser.add_argument("--store-bg-cover", help="Use steam store background as a game cover", action="store_true")
+    parser.add_argument("--skip-non-steam", help="Do not import games that are no longer on Steam store", action="store_true")
+    parser.add_argument("--use-only-library", help="Do not use steam store to fetch game info, fetch everything from library", action="store_true")
+    parser.add_argument("--skip-free-steam", help="Do not import free2play games", action="store_true")
+    parser.add_argument("--unsorted", help="Do not sort games by name in Notion views", action="store_true")
+    parser.add_argument("--notion-batch-size", help="Number of games imported to Notion in one transaction (default: 50)", type=int, default=50)
+    parser.add_argument("--notion-workers", help="Number of parallel Notion import transactions (default: 4)", type=int, default=4)
+    parser.add_argument("--http2", help="Use HTTP/2 where possible, needs httpx[http2] installed", action="store_true")
+    parser.add_argument("--profile", help="Print run performance summary, or write it to the given json file", nargs="?", const="-", metavar="JSON")
+    parser.add_argument("--include-ids", help="Import only games with these comma separated app ids", type=parse_ids)
+    parser.add_argument("--exclude-ids", help="Do not import games with these comma separated app ids", type=parse_ids)
+    parser.add_argument("--name-pattern", help="Import only games with name matching the regular expression (case insensitive)")
+    parser.add_argument("--min-playtime", help="Import only games played at least the given minutes", type=int, default=0)
+    parser.add_argument("--played-within", help="Import only games played in the last given days", type=int, metavar="DAYS")
+    parser.add_argument("--top-played", help="Import only the given number of most played games", type=int, metavar="N")
+    parser.add_argument("--app-catalog", help="Json dump of Steam GetAppList, games marked delisted in it are not requested from store")
+    parser.add_argument("--steam-workers", help="Number of parallel Steam store requests (default: 4)", type=int, default=4)
+
+
+def game_selection(args: argparse.Namespace) -> GameSelection:
+    """ Game selection from the parsed options, checks options that can't be used together """
+    selection = GameSelection(
+        include_ids=args.include_ids,
+        exclude_ids=args.exclude_ids,
+        name_pattern=args.name_pattern,
+        min_playtime=args.min_playtime,
+        played_within=args.played_within,
+        top_played=args.top_played,
+    )
+    assert not (args.skip_non_steam and args.use_only_library), "You can't use --skip-non-steam and --use-only-library together"
+    assert not (args.archive_missing and not selection.is_empty), "You can't use --archive-missing with game selection, not selected games would be archived"
+    return selection
+
+
+def app_catalog(args: argparse.Namespace) -> tp.Optional[SteamAppCatalog]:
+    return SteamAppCatalog(args.app_catalog) if args.app_catalog else None
+
+
+def report_profile(profile: tp.Optional[str], store: tp.Optional[SteamStoreApi] = None):
+    """ Print run performance summary or save it to json file, `profile` is the --profile value """
+    if profile is None:
+        return
+    report = dict(http=transport.get_transport().report())
+    if store is not None:
+        report["caches"] = dict(store=store.cache.stats)
+    if profile == "-":
+        echo.c("\n" + metrics.summary(**report))
+    else:
+        metrics.dump(profile, **report)
+        echo.c(f"\nProfile is saved to {profile}")
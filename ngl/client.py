@@ -1,24 +1,155 @@
+import queue
+import threading
+import time
 import typing as tp
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-from notion.block import CollectionViewPageBlock, DividerBlock, CalloutBlock
+import requests
+
+from notion.block import CollectionViewPageBlock, PageBlock
 from notion.client import NotionClient
-from notion.collection import Collection, CollectionRowBlock
-from notion.operations import build_operation
+from notion.collection import CalendarView, Collection, CollectionRowBlock, NotionDate, NotionSelect
+from notion.markdown import markdown_to_notion
+from notion.operations import build_operation, operation_update_last_edited
+from notion.utils import slugify
+from requests.cookies import cookiejar_from_dict
+
+from ngl.core.dates import parse_date
+from ngl.core.http import get_transport
+from ngl.core.journal import ImportJournal
+from ngl.core.metrics import metrics
+from ngl.core.ratelimit import AdaptiveConcurrency
+from ngl.core.retry import retry, status_code
+from ngl.errors import NotionApiError, ServiceError
+from ngl.games.base import GameInfo, TGameID
+
+from .utils import Progress, echo, color
+
+
+class PageBuilder:
+    """ Collects operations creating records with ids generated on client, so a tree of records is sent in one transaction """
+
+    def __init__(self, user_id: str, space_id: str):
+        self.user_id = user_id
+        self.space_id = space_id
+        self.operations = []  # type: tp.List[dict]
+
+    def add(self, table: str, parent_id: str, parent_table: str = "block", child_list_key: tp.Optional[str] = "content", **args) -> str:
+        """ Create record and append it to the `child_list_key` list of its parent, returns id of the record """
+        record_id = str(uuid.uuid4())
+        self.operations.append(build_operation(record_id, path=[], command="set", table=table, args=dict(
+            id=record_id,
+            version=1,
+            alive=True,
+            created_by_id=self.user_id,
+            created_by_table="notion_user",
+            created_time=int(datetime.now().timestamp() * 1000),
+            parent_id=parent_id,
+            parent_table=parent_table,
+            space_id=self.space_id,
+            **args
+        )))
+        if child_list_key:
+            self.append(parent_table, parent_id, child_list_key, record_id)
+        return record_id
+
+    def set(self, table: str, record_id: str, path: tp.List[str], value: tp.Any):
+        self.operations.append(build_operation(record_id, path=path, command="set", args=value, table=table))
+
+    def append(self, table: str, record_id: str, key: str, child_id: str):
+        """ Add child id to the end of the list """
+        self.operations.append(build_operation(record_id, path=[key], command="listAfter", args={"id": child_id}, table=table))
+
+
+class NotionWriter:
+    """ Write-only Notion client: only submits transactions, keeps no records and reads nothing back after writes """
+    API_URL = "https://www.notion.so/api/v3/"
+
+    def __init__(self, token_v2: str):
+        self.session = get_transport().mount(requests.Session())
+        self.session.cookies = cookiejar_from_dict({"token_v2": token_v2})
+        self.user_id, self.space_id = self._load_user()
+
+    @staticmethod
+    def _value(record: dict) -> dict:
+        # record map values are either `{"value": ..., "role": ...}` or the same wrapped in one more "value"
+        value = record.get("value") or {}
+        return value["value"] if "value" in value and "role" in value else value
+
+    def _load_user(self) -> tp.Tuple[str, str]:
+        records = self.post("loadUserContent", {}).json()["recordMap"]
+        user_id = next(iter(records["notion_user"]))
+        pointers = self._value(records.get("user_root", {}).get(user_id, {})).get("space_view_pointers")
+        space_id = pointers[0]["spaceId"] if pointers else next(iter(records["space"]))
+        return user_id, space_id
+
+    def post(self, endpoint: str, data: dict) -> requests.Response:
+        r = self.session.post(self.API_URL + endpoint, json=data)
+        r.raise_for_status()
+        return r
+
+    def submit_transaction(self, operations: tp.List[dict]):
+        # web client updates "last edited" of changed blocks in the same transaction
+        block_ids = {op["id"] for op in operations if op["table"] == "block"}
+        operations = operations + [operation_update_last_edited(self.user_id, block_id) for block_id in sorted(block_ids)]
+        self.post("submitTransaction", {"operations": operations})
+
+
+class GameListPage:
+    """ Ids and schema of game list database, enough to add rows without loading notion-py records """
 
-from ngl.errors import ServiceError
-from ngl.games.base import GameInfo
+    def __init__(self, id: str, collection_id: str, schema: tp.Dict[str, dict], view_ids: tp.List[str]):
+        self.id = id
+        self.collection_id = collection_id
+        self.schema = schema
+        self.view_ids = view_ids  # views where new rows are appended
+        self._properties = {}  # type: tp.Dict[str, str]
+        for prop_id, prop in schema.items():
+            self._properties.setdefault(prop_id, prop_id)
+            self._properties.setdefault(slugify(prop["name"]), prop_id)
+            if prop["type"] == "title":
+                self._properties.setdefault("title", prop_id)
 
-from .utils import echo, color
+    @classmethod
+    def from_block(cls, page: CollectionViewPageBlock) -> "GameListPage":
+        views = [view.id for view in page.views if view is not None and not isinstance(view, CalendarView)]
+        return cls(page.id, page.collection.id, page.collection.get("schema"), views)
+
+    def get_schema_property(self, identifier: str) -> tp.Optional[dict]:
+        """ Look up property by id or name like notion-py Collection does """
+        prop_id = self._properties.get(identifier) or self._properties.get(slugify(identifier))
+        return dict(self.schema[prop_id], id=prop_id) if prop_id is not None else None
 
 
 class NotionGameList:
     PAGE_COVER = "https://images.unsplash.com/photo-1559984430-c12e199879b6?ixlib=rb-1.2.1&q=85&fm=jpg&crop=entropy&cs=srgb&ixid=eyJhcHBfaWQiOjYzOTIxfQ"
     PAGE_ICON = "🎮"
+    STREAM_FLUSH_TIMEOUT = 1  # seconds to wait for more games before submitting incomplete batch
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+    # row ids are generated on client, so a transaction sent again after lost response does not duplicate rows
+    RETRY_EXCEPTIONS = (requests.HTTPError, requests.ConnectionError, requests.Timeout)
+    SUBMIT_RETRIES = 5
+    SUBMIT_BACKOFF = 1  # seconds, doubled on each retry
+    NOTION_HOST = "www.notion.so"
+    ROWS_QUERY_LIMIT = 1000  # rows asked in the first query of existing database
 
     def __init__(self, token_v2):
-        self.client = NotionClient(token_v2=token_v2)
+        self.writer = NotionWriter(token_v2)
+        self._token_v2 = token_v2
+        self._client = None
         self._gl_icon = "👾"
+        self.sync_stats = {}
+
+    @property
+    def client(self) -> NotionClient:
+        """ Full notion-py client with records store, created only to read existing pages """
+        if self._client is None:
+            self._client = NotionClient(token_v2=self._token_v2)
+            # notion-py logs in with its own session, all following requests share transport pool
+            get_transport().mount(self._client.session)
+        return self._client
 
     @classmethod
     def login(cls, token_v2=None):
@@ -29,106 +160,362 @@ class NotionGameList:
             token_v2 = input(color.c("Token: ")).strip()
         return cls(token_v2=token_v2)
 
-    def create_game_page(self, title: str = "Notion Game List", description: str = "My game list"):
-        page = self.client.current_space.add_page(title + " [generated]")
-        callout = page.children.add_new(CalloutBlock)
-        callout.title = "All your games inside Notion\n\n**Github:** [https://github.com/solesensei/notion-game-list](https://github.com/solesensei/notion-game-list)"
-        page.children.add_new(DividerBlock)
-        v = page.children.add_new(CollectionViewPageBlock)
-        v.collection = self.client.get_collection(self.client.create_record("collection", parent=v, schema=self._game_list_schema()))
-        v.title = title
-        v.description = description
-        table = v.views.add_new(view_type="table")
-        gallery = v.views.add_new(view_type="gallery")
-        calendar = v.views.add_new(view_type="calendar")
-        board = v.views.add_new(view_type="board")
-        table.name = "List"
-        gallery.name = "Gallery"
-        calendar.name = "Calendar"
-        board.name = "Board"
-        with self.client.as_atomic_transaction():
-            # Main Page: callout icon 💡
-            self.client.submit_transaction(
-                build_operation(callout.id, path=["format", "page_icon"], command="set", args="💡", table="block")
-            )
-            # Main Page: callout background
-            self.client.submit_transaction(
-                build_operation(callout.id, path=["format"], command="update", args=dict(block_color="brown_background"), table="block")
-            )
-            # Main Page: set cover image
-            self.client.submit_transaction(
-                build_operation(page.id, path=["format", "page_cover"], command="set", args=self.PAGE_COVER, table="block")
-            )
-            # Main Page: set icon 🎮
-            self.client.submit_transaction(
-                build_operation(page.id, path=["format", "page_icon"], command="set", args=self.PAGE_ICON, table="block")
-            )
-        with self.client.as_atomic_transaction():
-            # Game List Page: set icon 👾
-            self.client.submit_transaction(
-                build_operation(v.collection.id, path=["icon"], command="set", args=self._gl_icon, table="collection")
-            )
-            # Table: format columns
-            self.client.submit_transaction(
-                build_operation(table.id, path=[], command="update", args=self._properites_format(), table="collection_view")
-            )
-            # Board: group by status
-            self.client.submit_transaction(
-                build_operation(board.id, path=[], command="update", args=dict(query2={"group_by": "status"}), table="collection_view")
-            )
-            # Gallery: cover image
-            self.client.submit_transaction(
-                build_operation(gallery.id, path=[], command="update", args=self._gallery_format(), table="collection_view")
+    @metrics.timed("notion.create_game_page")
+    def create_game_page(self, title: str = "Notion Game List", description: str = "My game list", sort_by_name: bool = True):
+        """ Create page with game list database, the whole page is sent in one transaction """
+        builder = PageBuilder(self.writer.user_id, self.writer.space_id)
+        # Main Page: cover image, icon 🎮
+        page_id = builder.add(
+            "block", parent_id=self.writer.space_id, parent_table="space", child_list_key="pages",
+            type="page",
+            permissions=[{"role": "editor", "type": "user_permission", "user_id": self.writer.user_id}],
+            properties={"title": [[title + " [generated]"]]},
+            format={"page_icon": self.PAGE_ICON, "page_cover": self.PAGE_COVER},
+        )
+        # Main Page: callout with icon 💡 and background
+        builder.add(
+            "block", parent_id=page_id, type="callout",
+            properties={"title": markdown_to_notion(
+                "All your games inside Notion\n\n**Github:** [https://github.com/solesensei/notion-game-list](https://github.com/solesensei/notion-game-list)"
+            )},
+            format={"page_icon": "💡", "block_color": "brown_background"},
+        )
+        builder.add("block", parent_id=page_id, type="divider")
+        # Game List Page: icon 👾
+        game_page_id = builder.add("block", parent_id=page_id, type="collection_view_page")
+        schema = self._game_list_schema()
+        collection_id = builder.add(
+            "collection", parent_id=game_page_id, child_list_key=None,
+            schema=schema,
+            name=markdown_to_notion(title),
+            description=markdown_to_notion(description),
+            icon=self._gl_icon,
+        )
+        builder.set("block", game_page_id, ["collection_id"], collection_id)
+        views = (
+            ("table", "List", self._properites_format()),  # Table: format columns
+            ("gallery", "Gallery", self._gallery_format()),  # Gallery: cover image
+            ("calendar", "Calendar", {}),
+            ("board", "Board", dict(query2={"group_by": "status"})),  # Board: group by status
+        )
+        view_ids = []
+        for view_type, name, view_format in views:
+            if sort_by_name and view_type != "calendar":
+                # Table, Gallery, Board: sort by title, games are imported in order they were fetched
+                view_format = dict(view_format, query2=dict(view_format.get("query2", {}), sort=self._sort_by_title()))
+            view_id = builder.add(
+                "collection_view", parent_id=game_page_id, child_list_key="view_ids",
+                type=view_type, name=name, collection_id=collection_id, **view_format
             )
-        return v
+            if view_type != "calendar":
+                view_ids.append(view_id)
+        self.writer.submit_transaction(builder.operations)
+        return GameListPage(game_page_id, collection_id, schema, view_ids)
 
-    def connect_page(self, url):
-        pass
+    def connect_page(self, url: str) -> CollectionViewPageBlock:
+        """ Connect to existing game list database page or the generated page containing it """
+        page = self.client.get_block(url)
+        if isinstance(page, PageBlock) and not isinstance(page, CollectionViewPageBlock):
+            page = next((child for child in page.children if isinstance(child, CollectionViewPageBlock)), None)
+        if page is None or page.collection is None:
+            raise NotionApiError(msg=f"game list database not found by {url}")
+        self._ensure_game_id_property(page.collection)
+        return page
 
-    def _add_row(self, collection: Collection, **row_data) -> CollectionRowBlock:
-        return collection.add_row(**row_data)
+    def _ensure_game_id_property(self, collection: Collection):
+        # pages generated before sync support do not have game id column
+        if collection.get_schema_property("game_id") is None:
+            collection.set("schema.game_id", self._game_list_schema()["game_id"])
 
     @staticmethod
     def _parse_date(game: GameInfo):
-        date_str = game.release_date
-        if not date_str:
+        if not game.release_date:
             return None
-        check_date_formats = (r"%d %b, %Y", r"%b %d, %Y", r"%b %Y", r"%d %b %Y", r"%b %d %Y", r"%Y")
-        for fmt in check_date_formats:
-            try:
-                return datetime.strptime(date_str, fmt).date()
-            except ValueError:
-                pass
-        echo.r(
-            "\nGame '{}:{}' | Release Date: '{}' does not match any of formats '{}' | skip".format(
-                game.name, game.id, date_str, "', '".join(check_date_formats)
-            )
+        release_date = parse_date(game.release_date)
+        if release_date is None:
+            echo.r(f"\nGame '{game.name}:{game.id}' | Release Date: '{game.release_date}' does not match any known date format | skip")
+        return release_date
+
+    def _row_data(self, game: GameInfo) -> tp.Dict[str, tp.Any]:
+        return {"title": game.name, "game_id": str(game.id), "platforms": game.platforms, "release_date": self._parse_date(game), "notes": f"Playtime: {game.playtime}", "playtime": game.playtime_minutes}
+
+    @staticmethod
+    def _cover_uri(game: GameInfo, use_bg_as_cover: bool = False) -> tp.Optional[str]:
+        cover_img_uri = game.bg_uri or game.logo_uri if use_bg_as_cover else game.logo_uri
+        if not cover_img_uri:
+            echo.y(f"Game '{game.name}:{game.id}' does not have cover image")
+        return cover_img_uri
+
+    @metrics.timed("notion.add_game")
+    def add_game(self, game: GameInfo, game_page: tp.Union[GameListPage, CollectionViewPageBlock], use_bg_as_cover: bool = False) -> bool:
+        """ Add one game row with icon and cover in one transaction """
+        if not isinstance(game_page, GameListPage):
+            game_page = GameListPage.from_block(game_page)
+        self._update_select_options(game_page, [game])
+        self._submit_operations(self._game_operations(game, game_page, use_bg_as_cover), AdaptiveConcurrency(1))
+        return True
+
+    def _update_select_options(self, game_page: GameListPage, game_list: tp.List[GameInfo]):
+        # rows are written as raw properties, so new platforms have to be added to schema beforehand
+        prop = game_page.get_schema_property("platforms")
+        options = prop.get("options", [])
+        known = {option["value"].lower() for option in options}
+        new_options = [NotionSelect(p).to_dict() for p in sorted({p for game in game_list for p in game.platforms}) if p.lower() not in known]
+        if new_options:
+            game_page.schema[prop["id"]]["options"] = options + new_options
+            self.writer.submit_transaction([
+                build_operation(game_page.collection_id, path=["schema", prop["id"], "options"], command="set", args=options + new_options, table="collection")
+            ])
+
+    @staticmethod
+    def _notion_value(value: tp.Any, prop: dict) -> tp.Any:
+        """ Property value in Notion format for property types of game list """
+        if prop["type"] in ("title", "text"):
+            return markdown_to_notion(value or "")
+        if prop["type"] == "number":
+            return [[str(value)]] if value is not None else None
+        if prop["type"] in ("select", "multi_select"):
+            values = value if isinstance(value, list) else [value] if value else []
+            return [[",".join(values)]]
+        if prop["type"] == "date":
+            return NotionDate(value).to_notion() if value else []
+        raise NotionApiError(msg=f"property type '{prop['type']}' is not supported")
+
+    def _game_operations(self, game: GameInfo, game_page: GameListPage, use_bg_as_cover: bool = False) -> tp.List[dict]:
+        """ Build operations creating game row with properties, icon and cover """
+        builder = PageBuilder(self.writer.user_id, self.writer.space_id)
+        properties = {}
+        for key, value in self._row_data(game).items():
+            prop = game_page.get_schema_property(key)
+            properties[prop["id"]] = self._notion_value(value, prop)
+        # Game icon and cover image
+        page_format = {"page_icon": game.icon_uri or self._gl_icon}
+        cover_img_uri = self._cover_uri(game, use_bg_as_cover)
+        if cover_img_uri:
+            page_format["page_cover"] = cover_img_uri
+        row_id = builder.add(
+            "block", parent_id=game_page.collection_id, parent_table="collection", child_list_key=None,
+            type="page", properties=properties, format=page_format,
         )
-        return None
+        # Insert row at the end of each view
+        for view_id in game_page.view_ids:
+            builder.append("collection_view", view_id, "page_sort", row_id)
+        return builder.operations
 
-    def add_game(self, game: GameInfo, game_page: CollectionViewPageBlock, use_bg_as_cover: bool = False) -> bool:
-        row_data = {"title": game.name, "platforms": game.platforms, "release_date": self._parse_date(game), "notes": f"Playtime: {game.playtime}", "playtime": game.playtime_minutes}
-        row = self._add_row(game_page.collection, **row_data)
-        row.icon = game.icon_uri or self._gl_icon
-        with self.client.as_atomic_transaction():
-            # Game cover image
-            cover_img_uri = game.bg_uri or game.logo_uri if use_bg_as_cover else game.logo_uri
-            if cover_img_uri:
-                self.client.submit_transaction(
-                    build_operation(row.id, path=["format", "page_cover"], command="set", args=cover_img_uri, table="block")
-                )
+    @retry(RETRY_EXCEPTIONS, retries=SUBMIT_RETRIES, backoff=SUBMIT_BACKOFF, status_codes=RETRY_STATUS_CODES, host=NOTION_HOST)
+    def _submit_operations(self, operations: tp.List[dict], limiter: AdaptiveConcurrency):
+        """ Submit transaction, backing off and lowering concurrency while Notion throttles or fails """
+        with limiter.slot():
+            try:
+                self.writer.submit_transaction(operations)
+            except requests.HTTPError as e:
+                if status_code(e) in self.RETRY_STATUS_CODES:
+                    limiter.throttled()
+                raise
+            limiter.succeeded()
+
+    @metrics.timed("notion.submit_batch")
+    def _submit_batch(self, batch: tp.List[tp.Tuple[GameInfo, tp.List[dict]]], limiter: AdaptiveConcurrency, journal: tp.Optional[ImportJournal] = None) -> tp.List[GameInfo]:
+        """ Submit games as one transaction, failed batch is split in halves and retried, returns not imported games """
+        started = time.monotonic()
+        try:
+            self._submit_operations([operation for _, operations in batch for operation in operations], limiter)
+        except Exception as e:
+            if len(batch) == 1:
+                game = batch[0][0]
+                echo.r(f"\nGame '{game.name}:{game.id}' was not imported: {e}")
+                return [game]
+            middle = len(batch) // 2
+            return self._submit_batch(batch[:middle], limiter, journal) + self._submit_batch(batch[middle:], limiter, journal)
+        elapsed = time.monotonic() - started
+        if journal is not None:
+            journal.commit([game.id for game, _ in batch])
+        for _ in batch:
+            # per game, so profile percentiles show the latency every imported game saw
+            metrics.observe("notion.game_import", elapsed)
+        return []
+
+    def import_game_list(self, game_list: tp.List[GameInfo], game_page: tp.Union[GameListPage, CollectionViewPageBlock], **kwargs) -> tp.List[GameInfo]:
+        """ Import games submitting one transaction per `batch_size` games from parallel workers, returns not imported games """
+        _, errors = self.import_game_stream(game_list, game_page, total=len(game_list), **kwargs)
+        return errors
+
+    @staticmethod
+    def _put(games_queue: queue.Queue, item: tp.Any, stop: threading.Event) -> bool:
+        """ Put item unless consumer has stopped, returns False if it has """
+        while not stop.is_set():
+            try:
+                games_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @classmethod
+    def _produce(cls, games: tp.Iterable[GameInfo], games_queue: queue.Queue, end: object, stop: threading.Event):
+        try:
+            for game in games:
+                if not cls._put(games_queue, game, stop):
+                    break
+            else:
+                cls._put(games_queue, end, stop)
+        except BaseException as e:
+            cls._put(games_queue, e, stop)
+        finally:
+            # stopped generator cancels its queued store requests
+            close = getattr(games, "close", None)
+            if close is not None:
+                close()
+
+    def import_game_stream(
+        self,
+        games: tp.Iterable[GameInfo],
+        game_page: tp.Union[GameListPage, CollectionViewPageBlock],
+        batch_size: int = 50,
+        workers: int = 4,
+        queue_size: tp.Optional[int] = None,
+        journal: tp.Optional[ImportJournal] = None,
+        total: tp.Optional[int] = None,
+        **kwargs
+    ) -> tp.Tuple[int, tp.List[GameInfo]]:
+        """ Import games while they are produced, returns number of received games and not imported games
+
+        Games are read in background thread through bounded queue, incomplete batch is submitted
+        when no game arrives in `STREAM_FLUSH_TIMEOUT` seconds. Games committed to the `journal` are skipped,
+        so interrupted import can be resumed.
+        """
+        end, stop = object(), threading.Event()
+        games_queue = queue.Queue(maxsize=queue_size or batch_size * workers)
+        threading.Thread(target=self._produce, args=(games, games_queue, end, stop), daemon=True).start()
+        if not isinstance(game_page, GameListPage):
+            game_page = GameListPage.from_block(game_page)
+        limiter = AdaptiveConcurrency(workers)
+        received, errors, futures, batch = 0, [], [], []
+
+        progress = Progress("Imported", total=total)
+
+        def collect(block: bool):
+            # report progress in games order
+            nonlocal errors
+            while futures and (block or futures[0][1].done()):
+                size, future = futures.pop(0)
+                errors += future.result()
+                progress.update(size)
+                block = False
+
+        with ThreadPoolExecutor(max_workers=workers) as executor, progress:
+            try:
+                while True:
+                    try:
+                        game = games_queue.get(timeout=self.STREAM_FLUSH_TIMEOUT if batch else None)
+                    except queue.Empty:
+                        game = None  # producer is slow, do not hold already received games
+                    if isinstance(game, BaseException):
+                        raise game
+                    if isinstance(game, GameInfo):
+                        received += 1
+                        if journal is None or not journal.is_committed(game.id):
+                            batch.append(game)
+                    if batch and (game is None or game is end or len(batch) >= batch_size):
+                        self._update_select_options(game_page, batch)
+                        operations = [(g, self._game_operations(g, game_page, **kwargs)) for g in batch]
+                        futures.append((len(batch), executor.submit(self._submit_batch, operations, limiter, journal)))
+                        batch = []
+                        # do not read more games than workers can submit
+                        collect(block=len(futures) > 2 * workers)
+                    collect(block=False)
+                    if game is end:
+                        break
+                while futures:
+                    collect(block=True)
+            finally:
+                # tell producer to stop reading games, it cancels queued store requests
+                stop.set()
+        return received, errors
+
+    @classmethod
+    def _get_rows(cls, collection: Collection) -> tp.List[CollectionRowBlock]:
+        """ All database rows. notion-py asks for 100 rows by default and queryCollection has no offset,
+        so the limit grows until the result has fewer rows than asked
+        """
+        limit = cls.ROWS_QUERY_LIMIT
+        while True:
+            rows = collection.get_rows(limit=limit)
+            if len(rows) < limit:
+                return list(rows)
+            limit = max(limit * 4, rows.total + 1)
+
+    @classmethod
+    def _index_rows(cls, collection: Collection) -> tp.Tuple[tp.Dict[str, CollectionRowBlock], tp.Dict[str, CollectionRowBlock]]:
+        """ Index existing rows by game id and, for rows without it, by title """
+        by_id, by_title = {}, {}
+        for row in cls._get_rows(collection):
+            game_id = row.get_property("game_id")
+            if game_id:
+                by_id[game_id] = row
             else:
-                echo.y(f"Game '{game.name}:{game.id}' does not have cover image")
+                by_title.setdefault(row.title, row)
+        return by_id, by_title
+
+    def update_game(self, game: GameInfo, row: CollectionRowBlock) -> bool:
+        """ Update changed library values of existing game row, returns False if nothing has changed """
+        row_data = {}
+        if row.get_property("game_id") != str(game.id):
+            row_data["game_id"] = str(game.id)
+        if row.get_property("playtime") != game.playtime_minutes:
+            row_data["playtime"] = game.playtime_minutes
+            # do not overwrite notes written by user
+            if row.get_property("notes").startswith("Playtime: "):
+                row_data["notes"] = f"Playtime: {game.playtime}"
+        if not row_data:
+            return False
+        with self.client.as_atomic_transaction():
+            for key, value in row_data.items():
+                row.set_property(key, value)
         return True
 
-    def import_game_list(self, game_list: tp.List[GameInfo], game_page: CollectionViewPageBlock, **kwargs) -> tp.List[GameInfo]:
-        errors = []
-        for i, game in enumerate(game_list, start=1):
-            echo.c(f"Imported: {i}/{len(game_list)}", end="\r")
-            if not self.add_game(game, game_page, **kwargs):
-                errors.append(game)
+    def sync_game_list(
+        self,
+        game_list: tp.List[GameInfo],
+        game_page: CollectionViewPageBlock,
+        archive_missing: bool = False,
+        owned_ids: tp.Optional[tp.Iterable[TGameID]] = None,
+        **kwargs,
+    ) -> tp.List[GameInfo]:
+        """ Create new and update changed games in existing database, optionally archive rows of games not owned anymore
+
+        `owned_ids` is the whole library, games skipped on import (free, not in store) are still owned and not archived.
+        By default it is the ids of `game_list`.
+        """
+        by_id, by_title = self._index_rows(game_page.collection)
+        self.sync_stats = dict(created=0, updated=0, archived=0, unchanged=0)
+        new_games = []
+        with Progress("Synced", total=len(game_list)) as progress:
+            for game in game_list:
+                progress.update()
+                row = by_id.pop(str(game.id), None) or by_title.pop(game.name, None)
+                if row is None:
+                    new_games.append(game)
+                elif self.update_game(game, row):
+                    self.sync_stats["updated"] += 1
+                else:
+                    self.sync_stats["unchanged"] += 1
+        errors = self.import_game_list(new_games, game_page, **kwargs) if new_games else []
+        self.sync_stats["created"] = len(new_games) - len(errors)
+        if archive_missing:
+            owned_ids = {str(id_) for id_ in owned_ids} if owned_ids is not None else {str(game.id) for game in game_list}
+            # only rows created by the tool have game id, rows added by user are kept
+            for game_id, row in by_id.items():
+                if game_id in owned_ids:
+                    continue
+                row.remove()
+                self.sync_stats["archived"] += 1
         return errors
 
+    @staticmethod
+    def _sort_by_title():
+        return [{"property": "title", "direction": "ascending"}]
+
     @staticmethod
     def _gallery_format():
         return {
@@ -271,6 +658,7 @@ class NotionGameList:
             "time": {"name": "Time", "type": "date"},
             "release_date": {"name": "Release Date", "type": "date"},
             "playtime": {"name": "playtime", "type": "number"},
+            "game_id": {"name": "Game ID", "type": "text"},
         }
 
     @staticmethod
@@ -317,6 +705,11 @@ class NotionGameList:
                         "property": "playtime",
                         "visible": False,
                         "width": 100,
+                    },
+                    {
+                        "property": "game_id",
+                        "visible": False,
+                        "width": 100,
                     }
                 ]
             }
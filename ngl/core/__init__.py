@@ -1,9 +1,42 @@
+import typing as tp
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 
+from ngl.core.http import get_transport
+
+
+class LinkProber:
+    """ Checks that links exist without downloading their content
+
+    Only definitive answers are given: link exists (2xx) or it is gone (404, 410).
+    Connection errors, throttling and server errors give None, so they are not remembered as missing links.
+    """
+    GONE_STATUS_CODES = (404, 410)
+
+    def __init__(self, workers: int = 8, timeout: float = 3):
+        self.workers = workers
+        self.timeout = timeout
+        self.session = get_transport().session
+
+    def probe(self, url: str) -> tp.Optional[bool]:
+        try:
+            r = self.session.head(url, timeout=self.timeout, allow_redirects=True)
+            if r.status_code in (405, 501):
+                # HEAD is not supported, ask for the first byte only
+                r = self.session.get(url, timeout=self.timeout, headers={"Range": "bytes=0-0"}, stream=True)
+                r.close()
+        except requests.RequestException:
+            return None
+        if r.ok:
+            return True
+        if r.status_code in self.GONE_STATUS_CODES:
+            return False
+        return None
 
-def is_valid_link(url):
-    try:
-        r = requests.get(url, timeout=3)
-    except requests.Timeout:
-        return False
-    return r.ok
+    def probe_many(self, urls: tp.List[str]) -> tp.Dict[str, tp.Optional[bool]]:
+        if len(urls) <= 1:
+            # games resolved one by one probe a single link, a thread pool would only add its start and stop
+            return {url: self.probe(url) for url in urls}
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return dict(zip(urls, executor.map(self.probe, urls)))
@@ -0,0 +1,255 @@
+import json
+import os
+import threading
+import time
+import typing as tp
+from collections import OrderedDict
+
+from ngl.utils import load_from_file
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """ Exclusive lock between processes on `<filename>.lock`, not reentrant
+
+    Threads of one process must be serialized by the caller.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename + ".lock"
+        self._fh = None
+
+    def __enter__(self):
+        if self._fh is None:
+            self._fh = open(self.filename, "a+")
+        if fcntl is not None:
+            fcntl.flock(self._fh, fcntl.LOCK_EX)
+        else:
+            self._fh.seek(0)
+            msvcrt.locking(self._fh.fileno(), msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self._fh, fcntl.LOCK_UN)
+        else:
+            self._fh.seek(0)
+            msvcrt.locking(self._fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def close(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+class CacheStore:
+    """ Append-only JSON Lines key-value store split into named tables
+
+    Every write appends one `[table, key, value]` line, deletes append `[table, key]`.
+    The file is read once on first access and compacted when overwritten and deleted lines take more space than live ones,
+    space is counted in bytes, so a large record rewritten on every run (like a whole library) is compacted too.
+    Several processes may share the file: appends and compaction hold a file lock, compaction keeps
+    lines appended by others and replaces the file atomically, appends follow the replaced file.
+    """
+    COMPACT_MIN_BYTES = 1 << 20  # never compact small files
+    COMPACT_RATIO = 2            # compact when the file is larger than `ratio * live records size`
+
+    def __init__(self, filename: str, legacy_filename: tp.Optional[str] = None, legacy_table: tp.Optional[str] = None):
+        self.filename = filename
+        self.legacy_filename = legacy_filename
+        self.legacy_table = legacy_table
+        self._tables = {}  # type: tp.Dict[str, tp.Dict[str, tp.Any]]
+        self._sizes = {}  # type: tp.Dict[str, tp.Dict[str, int]]  # line size of live records
+        self._stale = 0  # size of overwritten and deleted lines
+        self._loaded = False
+        self._fh = None
+        self._lock = threading.RLock()
+        self._file_lock = FileLock(filename)
+
+    def __len__(self):
+        self._ensure_loaded()
+        return sum(len(t) for t in self._tables.values())
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.load()
+
+    def load(self):
+        """ Read the whole log into memory, migrating the legacy cache file if needed """
+        with self._lock:
+            self._loaded = True
+            if not os.path.exists(self.filename):
+                self._tables, self._sizes, self._stale = {}, {}, 0
+                self._migrate_legacy()
+                return
+            self._read()
+            live = sum(sum(sizes.values()) for sizes in self._sizes.values())
+            if live + self._stale > self.COMPACT_MIN_BYTES and live + self._stale > self.COMPACT_RATIO * live:
+                self.compact()
+
+    def _read(self):
+        self._tables, self._sizes, self._stale = {}, {}, 0
+        with open(self.filename, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # torn write of the last line
+                self._apply(record, len(line))
+
+    def _migrate_legacy(self):
+        if not self.legacy_filename or not self.legacy_table or not os.path.exists(self.legacy_filename):
+            return
+        with self._file_lock:
+            if os.path.exists(self.filename):
+                self._read()  # migrated by another process meanwhile
+                return
+            self._tables[self.legacy_table] = dict(load_from_file(self.legacy_filename))
+            self._rewrite()
+
+    def _apply(self, record: list, size: int):
+        """ Apply one log line of `size` characters, json lines are ascii so it is the size in bytes """
+        if len(record) == 3:
+            table, key, value = record
+            records, sizes = self._tables.setdefault(table, {}), self._sizes.setdefault(table, {})
+            records.pop(key, None)  # rewritten key moves to the end, records keep the order of their last write
+            records[key] = value
+            self._stale += sizes.get(key, 0)
+            sizes[key] = size
+        elif len(record) == 2:
+            table, key = record
+            self._tables.get(table, {}).pop(key, None)
+            self._stale += self._sizes.get(table, {}).pop(key, 0) + size
+
+    def _replaced(self) -> bool:
+        """ Whether the open log was replaced by compaction of another process """
+        try:
+            return os.fstat(self._fh.fileno()).st_ino != os.stat(self.filename).st_ino
+        except FileNotFoundError:
+            return True
+
+    def _append(self, record: list):
+        line = json.dumps(record) + "\n"
+        self._apply(record, len(line))
+        with self._file_lock:
+            if self._fh is not None and self._replaced():
+                self.close()
+            if self._fh is None:
+                self._fh = open(self.filename, "a", encoding="utf-8")
+            self._fh.write(line)
+            self._fh.flush()
+
+    def table(self, table: str) -> tp.Dict[str, tp.Any]:
+        """ Get all records of the table, the returned dict must not be modified """
+        self._ensure_loaded()
+        return self._tables.get(table, {})
+
+    def get(self, table: str, key: str, default: tp.Any = None) -> tp.Any:
+        return self.table(table).get(key, default)
+
+    def put(self, table: str, key: str, value: tp.Any):
+        with self._lock:
+            self._ensure_loaded()
+            self._append([table, key, value])
+
+    def delete(self, table: str, key: str):
+        with self._lock:
+            self._ensure_loaded()
+            if key in self._tables.get(table, {}):
+                self._append([table, key])
+
+    def compact(self):
+        """ Rewrite the log with live records only """
+        with self._lock, self._file_lock:
+            if os.path.exists(self.filename):
+                self._read()  # every own write is in the file, reading it again picks up writes of other processes
+            self._rewrite()
+
+    def _rewrite(self):
+        self.close()
+        tmp_filename = f"{self.filename}.{os.getpid()}.tmp"
+        self._sizes, self._stale = {}, 0
+        with open(tmp_filename, "w", encoding="utf-8") as f:
+            for table, records in self._tables.items():
+                sizes = self._sizes.setdefault(table, {})
+                for key, value in records.items():
+                    line = json.dumps([table, key, value]) + "\n"
+                    f.write(line)
+                    sizes[key] = len(line)
+        os.replace(tmp_filename, self.filename)
+
+    def close(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+class TTLCache:
+    """ Persistent cache over a CacheStore table with per-entry time to live and LRU eviction
+
+    Entries are stored as `{"t": created, "ttl": seconds, "v": value}`. Recency is tracked in memory only,
+    after restart entries are ordered by the time they were written.
+    """
+
+    def __init__(self, store: CacheStore, table: str, ttl: float, max_entries: int):
+        self.store = store
+        self.table = table
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lru = None  # type: tp.Optional[OrderedDict]
+        self._lock = threading.RLock()
+
+    @property
+    def stats(self) -> tp.Dict[str, int]:
+        return dict(hits=self.hits, misses=self.misses, evictions=self.evictions, size=len(self._entries()))
+
+    def __contains__(self, key: str) -> bool:
+        entry = self.store.get(self.table, key)
+        return entry is not None and time.time() - entry["t"] <= entry["ttl"]
+
+    def _entries(self) -> OrderedDict:
+        if self._lru is None:
+            self._lru = OrderedDict((k, None) for k in self.store.table(self.table))
+        return self._lru
+
+    def get(self, key: str, default: tp.Any = None) -> tp.Any:
+        with self._lock:
+            entry = self.store.get(self.table, key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if time.time() - entry["t"] > entry["ttl"]:
+                self.delete(key)
+                self.misses += 1
+                return default
+            self._entries().move_to_end(key)
+            self.hits += 1
+            return entry["v"]
+
+    def peek(self, key: str, default: tp.Any = None) -> tp.Any:
+        """ Value even if it is expired, nothing is evicted and recency is not changed, for read-only runs """
+        entry = self.store.get(self.table, key)
+        return entry["v"] if entry is not None else default
+
+    def put(self, key: str, value: tp.Any, ttl: tp.Optional[float] = None):
+        with self._lock:
+            entries = self._entries()
+            self.store.put(self.table, key, {"t": time.time(), "ttl": self.ttl if ttl is None else ttl, "v": value})
+            entries[key] = None
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                self.delete(next(iter(entries)))
+                self.evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            self.store.delete(self.table, key)
+            self._entries().pop(key, None)
@@ -0,0 +1,92 @@
+import re
+import typing as tp
+from datetime import date
+from functools import lru_cache
+
+
+def _months(*names: str) -> tp.Dict[str, int]:
+    """ Map space separated month names (january first) to month numbers """
+    return {name: i for i, month_names in enumerate(names, start=1) for name in month_names.split()}
+
+
+# full and short month names as Steam store shows them in different languages, punctuation is not a part of tokens
+MONTHS = {}  # type: tp.Dict[str, int]
+for _names in (
+    # english
+    ("january jan", "february feb", "march mar", "april apr", "may", "june jun", "july jul", "august aug",
+     "september sep sept", "october oct", "november nov", "december dec"),
+    # german
+    ("januar jän", "februar", "märz mär", "april", "mai", "juni", "juli", "august",
+     "september", "oktober okt", "november", "dezember dez"),
+    # french
+    ("janvier janv", "février févr fév", "mars", "avril avr", "mai", "juin", "juillet juil", "août",
+     "septembre", "octobre", "novembre", "décembre déc"),
+    # spanish
+    ("enero ene", "febrero", "marzo", "abril abr", "mayo", "junio", "julio", "agosto ago",
+     "septiembre setiembre", "octubre", "noviembre", "diciembre dic"),
+    # italian
+    ("gennaio gen", "febbraio", "marzo", "aprile", "maggio mag", "giugno giu", "luglio lug", "agosto",
+     "settembre set", "ottobre ott", "novembre", "dicembre"),
+    # portuguese
+    ("janeiro", "fevereiro fev", "março", "abril", "maio", "junho", "julho", "agosto",
+     "setembro", "outubro out", "novembro", "dezembro"),
+    # russian, genitive and short forms
+    ("января янв", "февраля фев февр", "марта мар", "апреля апр", "мая май", "июня июн", "июля июл", "августа авг",
+     "сентября сен сент", "октября окт", "ноября ноя нояб", "декабря дек"),
+):
+    MONTHS.update(_months(*_names))
+
+# words allowed around date parts: `1 de nov. de 2000`, `1er`, `1 нояб. 2000 г.`, `2000年11月1日`,
+# any other word (`Early 2025`, `Summer 2021`, `Q1 2020`) makes the date unknown
+FILLER_WORDS = frozenset(("de", "er", "г", "年", "月", "日"))
+
+_TOKENS = re.compile(r"\d+|[^\W\d_]+")
+_ISO_DATE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})$")
+
+
+@lru_cache(maxsize=4096)
+def parse_date(raw: str) -> tp.Optional[date]:
+    """ Parse store release date like `1 Nov, 2000`, `Nov 1, 2000`, `Nov 2000`, `2000`, `2000-11-01`
+    or the same with localized month names. Returns None for dates like `Coming soon`, `Early 2025` or `Q1 2020`.
+    """
+    iso = _ISO_DATE.match(raw)
+    if iso:
+        numbers, month = [int(n) for n in iso.groups()], None
+    else:
+        tokens = _TOKENS.findall(raw.lower())
+        numbers = [int(t) for t in tokens if t.isdigit()]
+        words = [t for t in tokens if not t.isdigit()]
+        if any(w not in MONTHS and w not in FILLER_WORDS for w in words):
+            return None
+        months = [MONTHS[w] for w in words if w in MONTHS]
+        if len(months) > 1:
+            return None
+        month = months[0] if months else None
+
+    years = [i for i, n in enumerate(numbers) if n >= 1000]
+    if len(years) != 1:
+        return None
+    year = numbers.pop(years[0])
+    if month is not None:
+        if len(numbers) > 1:
+            return None
+        day = numbers[0] if numbers else 1
+    elif not numbers:
+        month, day = 1, 1
+    elif len(numbers) == 2:
+        # year first is `2000-11-01` or `2000年11月1日`, year last is `01.11.2000`
+        month, day = numbers if years[0] == 0 else reversed(numbers)
+    else:
+        return None
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def normalize_date(raw: tp.Optional[str]) -> tp.Optional[str]:
+    """ ISO date for the raw release date, unknown formats are kept as is """
+    if not raw:
+        return None
+    parsed = parse_date(raw)
+    return parsed.isoformat() if parsed is not None else raw
@@ -0,0 +1,181 @@
+import threading
+import time
+import typing as tp
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from ngl.core.metrics import metrics
+from ngl.utils import echo
+
+try:
+    import h2  # noqa: F401, needed by httpx for HTTP/2
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class HostStats:
+    """ Requests, errors, latency and transferred bytes of one host """
+    __slots__ = ("requests", "errors", "seconds", "bytes_sent", "bytes_received")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def to_dict(self) -> dict:
+        return dict(
+            requests=self.requests,
+            errors=self.errors,
+            avg_latency=self.seconds / self.requests if self.requests else 0.0,
+            bytes_sent=self.bytes_sent,
+            bytes_received=self.bytes_received,
+        )
+
+
+class InstrumentedAdapter(HTTPAdapter):
+    """ Pooled adapter that counts requests and latency per host """
+
+    def __init__(self, transport: "Transport", **kwargs):
+        self.transport = transport
+        super().__init__(**kwargs)
+
+    def _send(self, request, **kwargs) -> requests.Response:
+        return super().send(request, **kwargs)
+
+    def send(self, request, timeout=None, **kwargs) -> requests.Response:
+        kwargs["timeout"] = self.transport.timeout if timeout is None else timeout
+        started = time.perf_counter()
+        response = None
+        try:
+            response = self._send(request, **kwargs)
+            return response
+        finally:
+            self.transport.record(
+                urlsplit(request.url).hostname,
+                time.perf_counter() - started,
+                error=response is None or response.status_code >= 500,
+                bytes_sent=len(request.body or b""),
+                # compressed size, body itself is not read yet
+                bytes_received=int(response.headers.get("Content-Length") or 0) if response is not None else 0,
+            )
+
+
+class Http2Adapter(InstrumentedAdapter):
+    """ Sends requests through httpx client with HTTP/2 so many parallel requests share one connection per host """
+
+    def __init__(self, transport: "Transport", client: "httpx.Client", **kwargs):
+        self.client = client
+        super().__init__(transport, **kwargs)
+
+    def _send(self, request, stream=False, timeout=None, **kwargs) -> requests.Response:
+        if isinstance(timeout, tuple):
+            timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+        try:
+            r = self.client.request(request.method, request.url, headers=dict(request.headers), content=request.body, timeout=timeout)
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(e, request=request)
+        except httpx.HTTPError as e:
+            raise requests.ConnectionError(e, request=request)
+        response = requests.Response()
+        response.status_code = r.status_code
+        response.headers = CaseInsensitiveDict(r.headers)
+        response.headers.pop("content-encoding", None)  # httpx has already decoded the body
+        response._content = r.content
+        response._content_consumed = True
+        response.encoding = r.encoding
+        response.reason = r.reason_phrase
+        response.url = request.url
+        response.request = request
+        response.elapsed = r.elapsed
+        response.connection = self
+        return response
+
+    def close(self):
+        super().close()
+        self.client.close()
+
+
+class Transport:
+    """ HTTP connections shared by Steam, CDN and Notion clients
+
+    Every client uses a session mounted with the same pooled adapter, so connections (and TLS handshakes) are reused
+    across clients and the number of parallel connections per host is limited by `pool_maxsize`.
+    Responses are gzip encoded when the server supports it, connections are kept alive by the pool.
+    Requests without timeout get the transport one.
+    """
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 32, timeout: float = 30, http2: bool = False):
+        self.timeout = timeout
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.http2 = http2 and httpx is not None
+        if http2 and not self.http2:
+            echo.r("HTTP/2 needs httpx[http2] installed, falling back to HTTP/1.1")
+        self.stats = {}  # type: tp.Dict[str, HostStats]
+        self._lock = threading.Lock()
+        self.adapter = self._adapter()
+        self.session = self.mount(requests.Session())
+
+    def _adapter(self, **kwargs) -> HTTPAdapter:
+        kwargs.update(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize, pool_block=True)
+        if self.http2:
+            limits = httpx.Limits(max_connections=self.pool_maxsize, max_keepalive_connections=self.pool_maxsize)
+            return Http2Adapter(self, httpx.Client(http2=True, limits=limits, timeout=self.timeout), **kwargs)
+        return InstrumentedAdapter(self, **kwargs)
+
+    def mount(self, session: requests.Session) -> requests.Session:
+        """ Route session requests through the shared pool, session retry settings are kept in its own adapter """
+        adapter = self.adapter
+        retries = session.get_adapter("https://").max_retries
+        if retries.total or retries.status_forcelist:
+            adapter = self._adapter(max_retries=retries)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.setdefault("Accept-Encoding", "gzip, deflate")
+        return session
+
+    def record(self, host: str, seconds: float, error: bool = False, bytes_sent: int = 0, bytes_received: int = 0):
+        with self._lock:
+            stats = self.stats.get(host)
+            if stats is None:
+                stats = self.stats[host] = HostStats()
+            stats.requests += 1
+            stats.errors += error
+            stats.seconds += seconds
+            stats.bytes_sent += bytes_sent
+            stats.bytes_received += bytes_received
+        metrics.observe(f"http {host}", seconds)
+
+    def report(self) -> tp.Dict[str, dict]:
+        with self._lock:
+            return {host: stats.to_dict() for host, stats in sorted(self.stats.items())}
+
+    def close(self):
+        self.session.close()
+
+
+_transport = None  # type: tp.Optional[Transport]
+_transport_lock = threading.Lock()
+
+
+def configure(**kwargs) -> Transport:
+    """ Replace shared transport, must be called before clients are created """
+    global _transport
+    with _transport_lock:
+        _transport = Transport(**kwargs)
+        return _transport
+
+
+def get_transport() -> Transport:
+    """ Shared transport, created with default settings on first use """
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = Transport()
+        return _transport
@@ -0,0 +1,35 @@
+import os
+import typing as tp
+
+from ngl.core.cache import CacheStore
+
+
+class ImportJournal:
+    """ On-disk checkpoint of the running import: target page and games already written to it """
+    JOURNAL_FILE = "import_journal.jsonl"
+
+    def __init__(self, filename: str = JOURNAL_FILE):
+        self.filename = filename
+        self.store = CacheStore(filename)
+
+    @property
+    def page_id(self) -> tp.Optional[str]:
+        return self.store.get("page", "id")
+
+    def start(self, page_id: str):
+        """ Start journal for the new import page, previous checkpoint is dropped """
+        self.clear()
+        self.store.put("page", "id", page_id)
+
+    def commit(self, game_ids: tp.List[str]):
+        for game_id in game_ids:
+            self.store.put("games", str(game_id), True)
+
+    def is_committed(self, game_id: str) -> bool:
+        return str(game_id) in self.store.table("games")
+
+    def clear(self):
+        self.store.close()
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+        self.store.load()
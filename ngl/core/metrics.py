@@ -0,0 +1,96 @@
+import json
+import threading
+import time
+import typing as tp
+from contextlib import contextmanager
+from functools import wraps
+
+
+def percentile(samples: tp.List[float], p: float) -> float:
+    """ Nearest-rank percentile of sorted samples """
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, max(0, int(round(p / 100 * len(samples))) - 1))]
+
+
+class Metrics:
+    """ Thread-safe timings and counters of one run
+
+    Timings keep every sample to report p50/p95, a run makes thousands of calls at most.
+    Counters named `<name>.hits` and `<name>.misses` are reported as cache hit rate of `<name>`.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._timings = {}  # type: tp.Dict[str, tp.List[float]]
+        self._counters = {}  # type: tp.Dict[str, float]
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            self._timings.setdefault(name, []).append(seconds)
+
+    def incr(self, name: str, value: float = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    @contextmanager
+    def timer(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def timed(self, name: str):
+        """ Decorator recording duration of every call """
+        def decorator(f):
+            @wraps(f)
+            def wrapper(*args, **kwargs):
+                with self.timer(name):
+                    return f(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def report(self, **extra) -> tp.Dict[str, tp.Any]:
+        """ Run summary, extra sections (like per host http stats) are added as is """
+        with self._lock:
+            timings = {name: sorted(samples) for name, samples in self._timings.items()}
+            counters = dict(self._counters)
+        hit_rates = {}
+        for name in counters:
+            if name.endswith(".hits"):
+                cache = name[:-len(".hits")]
+                hits, misses = counters[name], counters.get(cache + ".misses", 0)
+                hit_rates[cache] = hits / (hits + misses) if hits + misses else 0.0
+        return dict(
+            elapsed=time.perf_counter() - self.started,
+            timings={
+                name: dict(count=len(s), total=sum(s), p50=percentile(s, 50), p95=percentile(s, 95), max=s[-1])
+                for name, s in sorted(timings.items())
+            },
+            counters=dict(sorted(counters.items())),
+            cache_hit_rates=dict(sorted(hit_rates.items())),
+            **extra,
+        )
+
+    def summary(self, **extra) -> str:
+        report = self.report(**extra)
+        lines = [f"Run time: {report['elapsed']:.2f}s"]
+        for name, t in report["timings"].items():
+            lines.append(f"  {name:<32} count {t['count']:>6}  total {t['total']:8.2f}s  p50 {t['p50'] * 1000:8.1f}ms  p95 {t['p95'] * 1000:8.1f}ms")
+        for name, value in report["counters"].items():
+            lines.append(f"  {name:<32} {value:g}")
+        for name, rate in report["cache_hit_rates"].items():
+            lines.append(f"  {name + ' hit rate':<32} {rate:.1%}")
+        for section in extra:
+            for name, values in report[section].items():
+                lines.append(f"  {section + ' ' + name:<32} " + "  ".join(f"{k} {v:.3g}" if isinstance(v, float) else f"{k} {v}" for k, v in values.items()))
+        return "\n".join(lines)
+
+    def dump(self, filename: str, **extra):
+        with open(filename, "w") as f:
+            json.dump(self.report(**extra), f, indent=2)
+
+
+metrics = Metrics()
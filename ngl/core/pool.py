@@ -0,0 +1,32 @@
+import typing as tp
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import islice
+
+T = tp.TypeVar("T")
+
+
+def map_unordered(fn: tp.Callable[[T], tp.Any], items: tp.Iterable[T], workers: int, window: tp.Optional[int] = None) -> tp.Iterator[tp.Tuple[T, Future]]:
+    """ Run `fn` over items in a thread pool, yields (item, done future) pairs in completion order
+
+    At most `window` (twice the workers by default) items are submitted at a time. When the generator is closed
+    before the end (consumer stopped or failed), not started items are cancelled and only running calls are waited for.
+    """
+    window = window or 2 * workers
+    items = iter(items)
+    executor = ThreadPoolExecutor(max_workers=workers)
+    pending = {}  # type: tp.Dict[Future, T]
+    try:
+        for item in islice(items, window):
+            pending[executor.submit(fn, item)] = item
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                for next_item in islice(items, 1):
+                    pending[executor.submit(fn, next_item)] = next_item
+                yield item, future
+    finally:
+        # shutdown(cancel_futures=True) needs python 3.9
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
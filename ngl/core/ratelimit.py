@@ -0,0 +1,74 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from ngl.core.metrics import metrics
+
+
+class TokenBucket:
+    """ Thread-safe token bucket, callers reserve tokens in order and sleep until their slot """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate  # tokens per second
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_limit(cls, requests: int, period: float, capacity: int = 1):
+        """ Bucket that never lets more than `requests` through in any `period` seconds window """
+        capacity = max(1, min(capacity, requests - 1))
+        return cls(rate=(requests - capacity) / period, capacity=capacity)
+
+    def reserve(self, tokens: int = 1) -> float:
+        """ Take tokens and return how many seconds the caller has to wait before using them """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def acquire(self, tokens: int = 1):
+        wait = self.reserve(tokens)
+        if wait > 0:
+            metrics.incr("ratelimit.wait_seconds", wait)
+            time.sleep(wait)
+
+
+class AdaptiveConcurrency:
+    """ Concurrency limit that halves when the service throttles and slowly grows back on success (AIMD) """
+
+    def __init__(self, limit: int, min_limit: int = 1):
+        self.max_limit = limit
+        self.min_limit = min_limit
+        self._limit = float(limit)
+        self._active = 0
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_limit, int(self._limit))
+
+    @contextmanager
+    def slot(self):
+        with self._cond:
+            while self._active >= self.limit:
+                self._cond.wait()
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
+
+    def succeeded(self):
+        with self._cond:
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            self._cond.notify_all()
+
+    def throttled(self):
+        with self._cond:
+            self._limit = max(self.min_limit, self._limit / 2)
@@ -0,0 +1,188 @@
+import asyncio
+import random
+import threading
+import time
+import typing as tp
+from email.utils import parsedate_to_datetime
+from functools import wraps
+
+from ngl.core.metrics import metrics
+from ngl.utils import echo
+
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+class CircuitBreaker:
+    """ Health of one host shared by all callers
+
+    Throttled host (429 or Retry-After) makes every caller wait until the given time.
+    After `failure_threshold` failures in a row the circuit opens and every caller waits `reset_timeout` seconds
+    before the next call, so a failing host gets a pause instead of a retry storm, then one more failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._throttled_until = 0.0
+        self._open_until = 0.0
+        self._lock = threading.Lock()
+
+    def wait_time(self) -> float:
+        """ Seconds to wait before the next call, while the host is throttled or the circuit is open """
+        now = time.monotonic()
+        return max(0.0, self._throttled_until - now, self._open_until - now)
+
+    def succeeded(self):
+        with self._lock:
+            self._failures = 0
+
+    def failed(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._open_until = time.monotonic() + self.reset_timeout
+
+    def throttled(self, delay: float):
+        with self._lock:
+            self._throttled_until = max(self._throttled_until, time.monotonic() + delay)
+
+
+_breakers = {}  # type: tp.Dict[str, CircuitBreaker]
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(host: str) -> CircuitBreaker:
+    """ Circuit breaker shared by all requests to the host """
+    with _breakers_lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker()
+        return _breakers[host]
+
+
+def _response(error: BaseException):
+    """ HTTP response of the error or of the error it was raised from """
+    while error is not None:
+        response = getattr(error, "response", None)
+        if response is not None:
+            return response
+        error = error.__cause__ or error.__context__
+    return None
+
+
+def status_code(error: BaseException) -> tp.Optional[int]:
+    return getattr(_response(error), "status_code", None)
+
+
+def retry_after(error: BaseException) -> tp.Optional[float]:
+    """ Seconds from Retry-After header, it is either a number of seconds or HTTP date """
+    value = getattr(_response(error), "headers", {}).get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, backoff: float, max_backoff: float, jitter: bool = True) -> float:
+    """ Exponential delay with equal jitter: half of the delay is fixed and half is random """
+    delay = min(max_backoff, backoff * 2 ** attempt)
+    return delay / 2 + random.uniform(0, delay / 2) if jitter else delay
+
+
+def retry(
+    exceptions: tp.Union[tp.Type[BaseException], tp.Tuple[tp.Type[BaseException], ...]] = Exception,
+    retries: int = 3,
+    backoff: float = 0.5,
+    max_backoff: float = 60,
+    jitter: bool = True,
+    status_codes: tp.Optional[tp.Iterable[int]] = None,
+    host: tp.Optional[str] = None,
+    raise_on_error: bool = True,
+    debug_msg: tp.Optional[str] = None,
+):
+    """ Retry sync or async function with exponential backoff
+
+    :param status_codes: retry only errors with these HTTP status codes, errors without response (connection errors,
+        timeouts) are always retried. By default all `exceptions` are retried
+    :param host: share throttling and failures with other calls to the host through its circuit breaker
+    :param raise_on_error: return None instead of raising the last error
+    :param debug_msg: message printed before every retry
+    """
+    status_codes = tuple(status_codes) if status_codes is not None else None
+    breaker = get_breaker(host) if host is not None else None
+
+    def next_delay(attempt: int, error: BaseException) -> tp.Optional[float]:
+        """ Seconds to wait before the next attempt, None if the error must not be retried """
+        code = status_code(error)
+        if status_codes is not None and code is not None and code not in status_codes:
+            return None
+        delay = retry_after(error)
+        throttled = delay is not None or code in THROTTLE_STATUS_CODES
+        if delay is None:
+            delay = backoff_delay(attempt, backoff, max_backoff, jitter)
+        if breaker is not None and throttled:
+            breaker.throttled(delay)
+        elif breaker is not None:
+            breaker.failed()  # throttling host is alive, it only asks everyone to slow down
+        if attempt >= retries:
+            return None
+        if debug_msg is not None:
+            echo.m(f"\n{debug_msg}, retry in {delay:.1f} seconds")
+        metrics.incr("retry.retries")
+        metrics.incr("retry.sleep_seconds", delay)
+        return delay
+
+    def decorator(f):
+        if asyncio.iscoroutinefunction(f):
+            @wraps(f)
+            async def async_wrapper(*args, **kwargs):
+                for attempt in range(retries + 1):
+                    if breaker is not None:
+                        wait = breaker.wait_time()
+                        if wait > 0:
+                            metrics.incr("retry.breaker_wait_seconds", wait)
+                            await asyncio.sleep(wait)
+                    try:
+                        result = await f(*args, **kwargs)
+                    except exceptions as e:
+                        delay = next_delay(attempt, e)
+                        if delay is None:
+                            if raise_on_error:
+                                raise
+                            return None
+                        await asyncio.sleep(delay)
+                        continue
+                    if breaker is not None:
+                        breaker.succeeded()
+                    return result
+            return async_wrapper
+
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            for attempt in range(retries + 1):
+                if breaker is not None:
+                    wait = breaker.wait_time()
+                    if wait > 0:
+                        metrics.incr("retry.breaker_wait_seconds", wait)
+                        time.sleep(wait)
+                try:
+                    result = f(*args, **kwargs)
+                except exceptions as e:
+                    delay = next_delay(attempt, e)
+                    if delay is None:
+                        if raise_on_error:
+                            raise
+                        return None
+                    time.sleep(delay)
+                    continue
+                if breaker is not None:
+                    breaker.succeeded()
+                return result
+        return wrapper
+    return decorator
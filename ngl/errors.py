@@ -41,3 +41,4 @@ class SteamApiNotFoundError(SteamApiError):
 
 class NotionApiError(ApiError):
     code = 502
+
@@ -1,11 +1,16 @@
+import sys
 import typing as tp
-
 from abc import abstractmethod, ABCMeta
+from array import array
+from functools import partial, reduce
+from itertools import compress, repeat
+from operator import and_
 
 TGameID = tp.Union[int, str]  # unique game identifier in library
 
 
 class GameInfo:
+    __slots__ = ("id", "name", "platforms", "release_date", "playtime", "playtime_minutes", "logo_uri", "bg_uri", "icon_uri", "free")
 
     def __init__(
         self,
@@ -22,7 +27,7 @@ class GameInfo:
     ):
         self.id = id
         self.name = name
-        self.platforms = platforms
+        self.platforms = [sys.intern(p) for p in platforms]
         self.release_date = release_date if release_date else None
         self.playtime = playtime if playtime else None
         self.playtime_minutes = playtime_minutes if playtime_minutes else 0
@@ -32,7 +37,123 @@ class GameInfo:
         self.free = free
 
     def to_dict(self):
-        return self.__dict__
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class GameCollection:
+    """ Column oriented storage of many games
+
+    Rows are plain columns without per game objects, platform lists are shared between games,
+    repeated strings (playtime, release dates) are interned. Filters run over whole columns with C level iteration.
+    """
+    _FREE = {None: -1, False: 0, True: 1}
+    _FREE_VALUES = {-1: None, 0: False, 1: True}
+
+    def __init__(self):
+        self.ids = []  # type: tp.List[str]
+        self.names = []  # type: tp.List[str]
+        self.release_dates = []  # type: tp.List[tp.Optional[str]]
+        self.playtimes = []  # type: tp.List[tp.Optional[str]]
+        self.playtime_minutes = array("l")
+        self.logo_uris = []  # type: tp.List[tp.Optional[str]]
+        self.bg_uris = []  # type: tp.List[tp.Optional[str]]
+        self.icon_uris = []  # type: tp.List[tp.Optional[str]]
+        self.free = array("b")  # -1 when unknown
+        self._platforms = array("H")  # index in `_platform_values`
+        self._platform_values = []  # type: tp.List[tp.Tuple[str, ...]]
+        self._index = {}  # type: tp.Dict[str, int]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self) -> tp.Iterator[GameInfo]:
+        return (self[i] for i in range(len(self)))
+
+    def __contains__(self, game_id: TGameID) -> bool:
+        return str(game_id) in self._index
+
+    def __getitem__(self, i: int) -> GameInfo:
+        return GameInfo(
+            self.ids[i],
+            self.names[i],
+            list(self._platform_values[self._platforms[i]]),
+            self.release_dates[i],
+            self.playtimes[i],
+            self.playtime_minutes[i],
+            self.logo_uris[i],
+            self.bg_uris[i],
+            self.icon_uris[i],
+            self._FREE_VALUES[self.free[i]],
+        )
+
+    def get(self, game_id: TGameID) -> tp.Optional[GameInfo]:
+        i = self._index.get(str(game_id))
+        return self[i] if i is not None else None
+
+    def _platform_index(self, platforms: tp.Iterable[str], lookup: tp.Dict[tuple, int]) -> int:
+        platforms = tuple(platforms)
+        i = lookup.get(platforms)
+        if i is None:
+            i = lookup[platforms] = len(self._platform_values)
+            self._platform_values.append(tuple(sys.intern(p) for p in platforms))
+        return i
+
+    def append(self, game: GameInfo):
+        self.extend([game.to_dict()])
+
+    def extend(self, records: tp.Iterable[dict]):
+        """ Append `GameInfo.to_dict` records column by column """
+        records = records if isinstance(records, list) else list(records)
+        intern = sys.intern
+        lookup = {v: i for i, v in enumerate(self._platform_values)}
+        self._index.update(zip((str(r["id"]) for r in records), range(len(self), len(self) + len(records))))
+        self.ids += [intern(str(r["id"])) for r in records]
+        self.names += [r["name"] for r in records]
+        self.release_dates += [r.get("release_date") and intern(r["release_date"]) for r in records]
+        self.playtimes += [r.get("playtime") and intern(r["playtime"]) for r in records]
+        self.playtime_minutes.extend([r.get("playtime_minutes") or 0 for r in records])
+        self.logo_uris += [r.get("logo_uri") for r in records]
+        self.bg_uris += [r.get("bg_uri") for r in records]
+        self.icon_uris += [r.get("icon_uri") for r in records]
+        self.free.extend([self._FREE[r.get("free")] for r in records])
+        self._platforms.extend([self._platform_index(r["platforms"], lookup) for r in records])
+
+    @classmethod
+    def from_records(cls, records: tp.Iterable[dict]) -> "GameCollection":
+        """ Bulk load from `GameInfo.to_dict` records, e.g. game cache table values """
+        collection = cls()
+        collection.extend(records)
+        return collection
+
+    def take(self, indexes: tp.Iterable[int]) -> "GameCollection":
+        return GameCollection.from_records([self[i].to_dict() for i in indexes])
+
+    def where(
+        self,
+        free: tp.Optional[bool] = None,
+        platform: tp.Optional[str] = None,
+        exclude_platform: tp.Optional[str] = None,
+        min_playtime: tp.Optional[int] = None,
+        max_playtime: tp.Optional[int] = None,
+    ) -> tp.List[int]:
+        """ Indexes of games matching all given conditions """
+        masks = []
+        if free is not None:
+            masks.append(map(self._FREE[free].__eq__, self.free))
+        if platform is not None or exclude_platform is not None:
+            # check each distinct platforms tuple once, then map rows to the result
+            matched = [
+                (platform is None or platform in values) and (exclude_platform is None or exclude_platform not in values)
+                for values in self._platform_values
+            ]
+            masks.append(map(matched.__getitem__, self._platforms))
+        if min_playtime is not None:
+            masks.append(map(min_playtime.__le__, self.playtime_minutes))
+        if max_playtime is not None:
+            masks.append(map(max_playtime.__ge__, self.playtime_minutes))
+        mask = reduce(partial(map, and_), masks) if masks else repeat(True)
+        return list(compress(range(len(self)), mask))
+
 
 class GamesLibrary(metaclass=ABCMeta):
 
@@ -0,0 +1,103 @@
+import json
+import os
+import sqlite3
+import threading
+import typing as tp
+
+from ngl.errors import ServiceError
+from ngl.utils import echo
+
+from .base import TGameID
+
+
+class CatalogApp(tp.NamedTuple):
+    id: str
+    name: str
+    type: tp.Optional[str]  # unknown when the dump has no types
+    delisted: bool
+
+
+class SteamAppCatalog:
+    """ Local index of Steam store apps built from a GetAppList json dump, answers without network
+
+    Dump is IStoreService/GetAppList or ISteamApps/GetAppList response (or just the list of apps) with apps like
+    `{"appid": 10, "name": "Counter-Strike", "type": "game", "delisted": true}`, `type` and `delisted` are optional.
+    Only apps marked `delisted` are treated as not in store: GetAppList lists games only by default,
+    so an app missing in the dump may still be on store. Steam responses have no `delisted` field, mark it yourself,
+    e.g. for apps of an older dump that are missing in a fresh IStoreService/GetAppList with every `include_*` flag set.
+    The dump is indexed once into `<dump>.sqlite` next to it, the index is rebuilt when the dump changes.
+    """
+    INDEX_SUFFIX = ".sqlite"
+    QUERY_CHUNK = 500  # ids in one `IN (...)` query, sqlite allows 999 parameters at least
+
+    def __init__(self, filename: str):
+        if not os.path.exists(filename):
+            raise ServiceError(msg=f"app catalog {filename} not found")
+        self.filename = filename
+        self.index_filename = filename + self.INDEX_SUFFIX
+        if not os.path.exists(self.index_filename) or os.path.getmtime(self.index_filename) < os.path.getmtime(filename):
+            self._build()
+        self._db = sqlite3.connect(self.index_filename, check_same_thread=False)
+        self._db.execute("PRAGMA query_only = 1")
+        self._lock = threading.Lock()
+        if not self._db.execute("SELECT 1 FROM apps WHERE delisted = 1 LIMIT 1").fetchone():
+            echo.r(f"App catalog {filename} has no apps marked delisted, every game is requested from store")
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM apps").fetchone()[0]
+
+    @staticmethod
+    def _load_apps(filename: str) -> tp.List[dict]:
+        try:
+            with open(filename, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except ValueError as e:
+            raise ServiceError(msg=f"app catalog {filename} is not valid json: {e}")
+        if isinstance(data, dict):
+            data = (data.get("applist") or data.get("response") or {}).get("apps")
+        if not isinstance(data, list):
+            raise ServiceError(msg=f"app catalog {filename} has no apps list")
+        return data
+
+    def _build(self):
+        apps = self._load_apps(self.filename)
+        # parallel runs may build the index at the same time, each one writes its own file
+        tmp_filename = f"{self.index_filename}.{os.getpid()}.tmp"
+        if os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
+        db = sqlite3.connect(tmp_filename)
+        try:
+            db.execute("CREATE TABLE apps (appid INTEGER PRIMARY KEY, name TEXT NOT NULL, type TEXT, delisted INTEGER NOT NULL)")
+            db.executemany(
+                "INSERT OR REPLACE INTO apps VALUES (?, ?, ?, ?)",
+                ((int(app["appid"]), app.get("name") or "", app.get("type") or None, int(bool(app.get("delisted")))) for app in apps),
+            )
+            db.commit()
+        finally:
+            db.close()
+        os.replace(tmp_filename, self.index_filename)
+
+    def get(self, app_id: TGameID) -> tp.Optional[CatalogApp]:
+        with self._lock:
+            row = self._db.execute("SELECT appid, name, type, delisted FROM apps WHERE appid = ?", (int(app_id),)).fetchone()
+        return CatalogApp(str(row[0]), row[1], row[2], bool(row[3])) if row is not None else None
+
+    def in_store(self, app_id: TGameID) -> tp.Optional[bool]:
+        """ Whether the app is on store, None if the app is missing in the dump and catalog can't tell """
+        app = self.get(app_id)
+        return not app.delisted if app is not None else None
+
+    def not_in_store(self, app_ids: tp.Iterable[TGameID]) -> tp.Set[str]:
+        """ Apps marked delisted in the dump, looked up with one query per `QUERY_CHUNK` ids """
+        app_ids = sorted({int(id_) for id_ in app_ids})
+        delisted = set()
+        with self._lock:
+            for start in range(0, len(app_ids), self.QUERY_CHUNK):
+                chunk = app_ids[start:start + self.QUERY_CHUNK]
+                rows = self._db.execute(f"SELECT appid FROM apps WHERE delisted = 1 AND appid IN ({','.join('?' * len(chunk))})", chunk)
+                delisted.update(str(row[0]) for row in rows)
+        return delisted
+
+    def close(self):
+        self._db.close()
@@ -0,0 +1,69 @@
+import re
+import time
+import typing as tp
+
+if tp.TYPE_CHECKING:
+    from .steam import OwnedGame
+
+RECENT_PLAYTIME_DAYS = 14  # library reports playtime of the last two weeks
+
+
+def parse_ids(value: str) -> tp.Set[str]:
+    """ Comma separated app ids, for argparse """
+    return {id_.strip() for id_ in value.split(",") if id_.strip()}
+
+
+class GameSelection:
+    """ Rules choosing library games by library data only, so excluded games cost no store or image requests
+
+    A game is selected when it matches every given rule, then `top_played` most played of them are kept.
+    """
+
+    def __init__(
+        self,
+        include_ids: tp.Optional[tp.Set[str]] = None,
+        exclude_ids: tp.Optional[tp.Set[str]] = None,
+        name_pattern: tp.Optional[str] = None,
+        min_playtime: int = 0,
+        played_within: tp.Optional[int] = None,
+        top_played: tp.Optional[int] = None,
+    ):
+        self.include_ids = {str(id_) for id_ in include_ids} if include_ids else None
+        self.exclude_ids = {str(id_) for id_ in exclude_ids} if exclude_ids else set()
+        self.name_pattern = re.compile(name_pattern, re.IGNORECASE) if name_pattern else None
+        self.min_playtime = min_playtime  # minutes
+        self.played_within = played_within  # days
+        self.top_played = top_played
+
+    @property
+    def is_empty(self) -> bool:
+        return (
+            self.include_ids is None and not self.exclude_ids and self.name_pattern is None
+            and not self.min_playtime and self.played_within is None and self.top_played is None
+        )
+
+    def _played_since(self, g: "OwnedGame", since: float) -> bool:
+        if g.rtime_last_played:
+            return g.rtime_last_played >= since
+        # old libraries have no last played time
+        return self.played_within >= RECENT_PLAYTIME_DAYS and g.playtime_2weeks > 0
+
+    def matches(self, g: "OwnedGame", since: float = 0) -> bool:
+        return (
+            (self.include_ids is None or g.id in self.include_ids)
+            and g.id not in self.exclude_ids
+            and (self.name_pattern is None or self.name_pattern.search(g.name) is not None)
+            and g.playtime_forever >= self.min_playtime
+            and (self.played_within is None or self._played_since(g, since))
+        )
+
+    def apply(self, games: tp.List["OwnedGame"]) -> tp.List["OwnedGame"]:
+        """ Selected games in the same order """
+        if self.is_empty:
+            return games
+        since = time.time() - self.played_within * 24 * 60 * 60 if self.played_within is not None else 0
+        selected = [g for g in games if self.matches(g, since)]
+        if self.top_played is not None:
+            top = {g.id for g in sorted(selected, key=lambda g: g.playtime_forever, reverse=True)[:self.top_played]}
+            selected = [g for g in selected if g.id in top]
+        return selected
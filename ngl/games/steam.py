@@ -1,63 +1,214 @@
 import re
 import typing as tp
+from contextlib import closing
+from functools import partial
 
 import requests
 
 from ngl.api.steam import steamapi
-from ngl.core import is_valid_link
+from ngl.core import LinkProber
+from ngl.core.cache import CacheStore, TTLCache
+from ngl.core.dates import normalize_date
+from ngl.core.http import get_transport
+from ngl.core.metrics import metrics
+from ngl.core.pool import map_unordered
+from ngl.core.ratelimit import TokenBucket
+from ngl.core.retry import retry
 from ngl.errors import SteamApiError, SteamApiNotFoundError, SteamStoreApiError
 from ngl.models.steam import SteamStoreApp
-from ngl.utils import color, echo, retry, dump_to_file, load_from_file
+from ngl.utils import Progress, color, echo
 
-from .base import GameInfo, GamesLibrary, TGameID
+from .base import GameCollection, GameInfo, GamesLibrary, TGameID
+from .catalog import SteamAppCatalog
+from .selection import GameSelection
 
 
 TSteamUserID = tp.Union[str, int]
 TSteamApiKey = str
 
 PLATFORM = "steam"
+STORE_HOST = "store.steampowered.com"
 
 
-class SteamStoreApi:
-    API_HOST = "https://store.steampowered.com/api/appdetails?appids={}"
+class OwnedGame(tp.NamedTuple):
+    """ Library row of GetOwnedGames response """
+    id: str
+    name: str
+    playtime_forever: int = 0
+    playtime_2weeks: int = 0
+    rtime_last_played: int = 0
+    img_icon_url: tp.Optional[str] = None
+    img_logo_url: tp.Optional[str] = None
+
 
-    def __init__(self):
-        self.session = requests.Session()
-        self._cache = {}
+class SteamStoreApi:
+    API_HOST = f"https://{STORE_HOST}/api/appdetails"
+    API_FILTERS = "basic,release_date,price_overview"  # only fields used to build game info
+    # store accepts many appids in one request only with `filters=price_overview`
+    BATCH_FILTERS = "price_overview"
+    BATCH_SIZE = 100
+    RATE_LIMIT = (200, 5 * 60)  # Store allows about 200 requests per 5 minutes
+    RATE_BURST = 10
+    CACHE_FILE = "store_cache.jsonl"
+    CACHE_TTL = 30 * 24 * 60 * 60
+    CACHE_NOT_FOUND_TTL = 24 * 60 * 60  # game may come back to store
+    CACHE_MAX_ENTRIES = 20000
+
+    def __init__(self, workers: int = 4):
+        self.session = get_transport().session
+        self.limiter = TokenBucket.for_limit(*self.RATE_LIMIT, capacity=self.RATE_BURST)
+        self.workers = workers
+        self.cache = TTLCache(CacheStore(self.CACHE_FILE), "appdetails", ttl=self.CACHE_TTL, max_entries=self.CACHE_MAX_ENTRIES)
+
+    def _get_app_details(self, game_id: str, use_cache: bool = True) -> dict:
+        """ Get raw appdetails response of the game, both found and not found answers are cached """
+        response_body = self.cache.get(game_id) if use_cache else None
+        if response_body is None:
+            self.limiter.acquire()
+            r = self.session.get(self.API_HOST, params={"appids": game_id, "filters": self.API_FILTERS}, timeout=3)
+            try:
+                r.raise_for_status()
+            except requests.HTTPError as e:
+                raise SteamStoreApiError(f"can't get {r.url}, code: {r.status_code}, text: {r.text}") from e
+            response_body = r.json()[game_id]
+            self.cache.put(game_id, response_body, ttl=None if response_body["success"] else self.CACHE_NOT_FOUND_TTL)
+        return response_body
+
+    def _prefetch_batch(self, game_ids: tp.List[str]):
+        self.limiter.acquire()
+        r = self.session.get(self.API_HOST, params={"appids": ",".join(game_ids), "filters": self.BATCH_FILTERS}, timeout=10)
+        if not r.ok:
+            raise SteamStoreApiError(f"can't get {r.url}, code: {r.status_code}, text: {r.text}")
+        for game_id, response_body in (r.json() or {}).items():
+            if not response_body["success"]:
+                self.cache.put(game_id, response_body, ttl=self.CACHE_NOT_FOUND_TTL)
+
+    def prefetch_not_found(self, game_ids: tp.List[TGameID], use_cache: bool = True):
+        """ Find games missing in store with one request per `BATCH_SIZE` games and cache them as not found,
+        so they do not spend separate requests later. Without `use_cache` lookups ignore cached answers, nothing is prefetched.
+        """
+        if not use_cache:
+            return
+        game_ids = [str(id_) for id_ in game_ids if str(id_) not in self.cache]
+        if len(game_ids) < 2:
+            return
+        for start in range(0, len(game_ids), self.BATCH_SIZE):
+            try:
+                self._prefetch_batch(game_ids[start:start + self.BATCH_SIZE])
+            except Exception:
+                pass  # not found games will be fetched one by one
 
-    @retry(SteamStoreApiError, retry_num=2, initial_wait=90, backoff=1, raise_on_error=False, debug_msg="Limit StoreSteamAPI requests exceeded", debug=True)
-    def get_game_info(self, game_id: TGameID) -> tp.Optional[SteamStoreApp]:
+    @metrics.timed("steam.store.get_game_info")
+    @retry(SteamStoreApiError, retries=3, backoff=10, max_backoff=120, host=STORE_HOST, raise_on_error=False, debug_msg="Limit StoreSteamAPI requests exceeded")
+    def get_game_info(self, game_id: TGameID, use_cache: bool = True) -> tp.Optional[SteamStoreApp]:
         game_id = str(game_id)
-        if game_id in self._cache:
-            return self._cache[game_id]
         try:
-            r = self.session.get(self.API_HOST.format(game_id), timeout=3)
-            if not r.ok:
-                raise SteamStoreApiError(f"can't get {r.url}, code: {r.status_code}, text: {r.text}")
-
-            response_body = r.json()[str(game_id)]
+            response_body = self._get_app_details(game_id, use_cache=use_cache)
             if not response_body["success"]:
                 raise SteamApiNotFoundError(f"Game {game_id} unsuccessfull request")
-
-            self._cache[game_id] = SteamStoreApp.load(response_body["data"])
-            return self._cache[game_id]
+            return SteamStoreApp.load(response_body["data"])
         except (SteamApiNotFoundError, SteamStoreApiError):
             raise
         except Exception as e:
             raise SteamApiError(error=e)
 
+    def get_cached_game_info(self, game_id: TGameID) -> tp.Optional[SteamStoreApp]:
+        """ Game info from store cache only, None if the game is not cached or not found in store.
+        Expired answers are used too and nothing is evicted, offline runs do not change the cache.
+        """
+        response_body = self.cache.peek(str(game_id))
+        if response_body is None or not response_body["success"]:
+            return None
+        return SteamStoreApp.load(response_body["data"])
+
+    def find_game_info(self, game_id: TGameID, use_cache: bool = True) -> tp.Optional[SteamStoreApp]:
+        """ Same as get_game_info, but returns None for games not found in store """
+        try:
+            return self.get_game_info(game_id, use_cache=use_cache)
+        except SteamApiNotFoundError:
+            return None
+
+    def get_games_info(self, game_ids: tp.List[TGameID]) -> tp.Iterator[tp.Tuple[TGameID, tp.Optional[SteamStoreApp]]]:
+        """ Fetch games in parallel, yields (game_id, game) pairs in completion order, game is None if not found """
+        with closing(map_unordered(self.find_game_info, game_ids, self.workers)) as results:
+            for game_id, future in results:
+                yield game_id, future.result()
+
+    def fetch_many(self, game_ids: tp.Iterable[TGameID]):
+        """ Fetch every game not cached yet once, so following lookups of any library are served from cache """
+        game_ids = sorted({str(id_) for id_ in game_ids if str(id_) not in self.cache})
+        self.prefetch_not_found(game_ids)
+        with Progress("Fetching", total=len(game_ids)) as progress:
+            for game_id, _ in self.get_games_info(game_ids):
+                progress.update(item=game_id)
+
 
 class SteamGamesLibrary(GamesLibrary):
+    OWNED_GAMES_API = "https://api.steampowered.com/IPlayerService/GetOwnedGames/v1/"
     IMAGE_HOST = "http://media.steampowered.com/steamcommunity/public/images/apps/"
-    CACHE_GAME_FILE = "game_info_cache.json"
-
-    def __init__(self, api_key: TSteamApiKey, user_id: TSteamUserID):
-        self.api = self._get_api(api_key)
-        self.store = SteamStoreApi()
-        self.user = self._get_user(user_id)
+    CACHE_GAME_FILE = "game_info_cache.jsonl"
+    LEGACY_CACHE_GAME_FILE = "game_info_cache.json"
+    CACHE_GAMES_TABLE = "games"
+    CACHE_LIBRARY_GAMES_TABLE = "library_games"  # games built without store data
+    CACHE_LINKS_TABLE = "links"
+    CACHE_USERS_TABLE = "users"  # vanity url -> steamid
+    CACHE_OWNED_GAMES_TABLE = "owned_games"  # steamid -> library rows
+    BG_IMAGE_HOST = "https://steamcdn-a.akamaihd.net/steam/apps/{game_id}/{bg}.jpg"
+    BG_IMAGE_NAMES = ("page.bg", "page_bg_generated")  # in order of preference
+
+    def __init__(
+        self,
+        api_key: TSteamApiKey,
+        user_id: TSteamUserID,
+        store_workers: int = 4,
+        store: tp.Optional[SteamStoreApi] = None,
+        cache: tp.Optional[CacheStore] = None,
+        catalog: tp.Optional[SteamAppCatalog] = None,
+        selection: tp.Optional[GameSelection] = None,
+    ):
+        """ `store` and `cache` can be shared by libraries of several users,
+        with `catalog` games it marks delisted are not requested from store,
+        games not matching `selection` are dropped before any store request
+        """
+        self.api_key = api_key
+        self.user_id = user_id
+        self.store = store if store is not None else SteamStoreApi(workers=store_workers)
+        self.prober = LinkProber()
+        self.cache = cache if cache is not None else self.open_cache()
+        self._api = None
+        self._steamid = None
+        self._owned_games = None  # type: tp.Optional[tp.List[OwnedGame]]
+        self.catalog = catalog
+        self.selection = selection
+        self._not_in_store = set()  # type: tp.Set[str]
         self._games = {}
         self._store_skipped = []
 
+    @classmethod
+    def open_cache(cls) -> CacheStore:
+        return CacheStore(cls.CACHE_GAME_FILE, legacy_filename=cls.LEGACY_CACHE_GAME_FILE, legacy_table=cls.CACHE_GAMES_TABLE)
+
+    @property
+    def api(self):
+        """ steamapi connection, created only when the user has to be resolved with it """
+        if self._api is None:
+            self._api = self._get_api(self.api_key)
+        return self._api
+
+    @property
+    def steamid(self) -> str:
+        """ Steam id of the user, vanity url is resolved once and then taken from cache """
+        if self._steamid is None:
+            user_id = str(self.user_id)
+            if user_id.isdigit():
+                self._steamid = user_id
+            else:
+                self._steamid = self.cache.get(self.CACHE_USERS_TABLE, user_id)
+            if self._steamid is None:
+                self._steamid = str(self._get_user(user_id).steamid)
+                self.cache.put(self.CACHE_USERS_TABLE, user_id, self._steamid)
+        return self._steamid
+
     def _get_api(self, api_key: TSteamApiKey):
         try:
             return steamapi.core.APIConnection(api_key=api_key, validate_key=True)
@@ -65,6 +216,7 @@ class SteamGamesLibrary(GamesLibrary):
             raise SteamApiError(error=e)
 
     def _get_user(self, user_id: TSteamUserID):
+        self.api  # steamapi requests go through the connection singleton
         try:
             return steamapi.user.SteamUser(user_id) if isinstance(user_id, int) else steamapi.user.SteamUser(userurl=user_id)
         except steamapi.errors.UserNotFoundError:
@@ -73,7 +225,7 @@ class SteamGamesLibrary(GamesLibrary):
             raise SteamApiError(error=e)
 
     @classmethod
-    def login(cls, api_key: tp.Optional[TSteamApiKey] = None, user_id: tp.Optional[TSteamUserID] = None):
+    def login(cls, api_key: tp.Optional[TSteamApiKey] = None, user_id: tp.Optional[TSteamUserID] = None, **kwargs):
         # TODO: parse library from profile url ?
         if api_key is None:
             echo(color.y("Get steam token from: ") + "https://steamcommunity.com/dev/apikey")
@@ -82,20 +234,40 @@ class SteamGamesLibrary(GamesLibrary):
             echo.y("Pass steam user profile id.")
             user_id = input(color.c("User: http://steamcommunity.com/id/")).strip()
             user_id = re.sub(r"^https?:\/\/steamcommunity\.com\/id\/", "", user_id)
-        return cls(api_key=api_key, user_id=user_id)
+        return cls(api_key=api_key, user_id=user_id, **kwargs)
 
     def _image_link(self, game_id: TGameID, img_hash: str):
         return self.IMAGE_HOST + f"{game_id}/{img_hash}.jpg"
 
-    def _get_bg_image(self, game_id: TGameID) -> tp.Optional[str]:
-        _bg_img = "https://steamcdn-a.akamaihd.net/steam/apps/{game_id}/{bg}.jpg"
-        bg_link = _bg_img.format(game_id=game_id, bg="page.bg")
-        if is_valid_link(bg_link):
-            return bg_link
-        bg_link = _bg_img.format(game_id=game_id, bg="page_bg_generated")
-        if is_valid_link(bg_link):
-            return bg_link
-        return None
+    @metrics.timed("steam.bg_images")
+    def _get_bg_images(self, game_ids: tp.List[TGameID], use_cache: bool = True, probe: bool = True) -> tp.Tuple[tp.Dict[str, str], tp.Set[str]]:
+        """ Find store backgrounds for games, links are probed concurrently and definitive results (also negative) are cached.
+        Returns found backgrounds and ids of games with a link that could not be probed, their result is not final.
+        """
+        bg_images, unknown = {}, set()
+        pending = [str(id_) for id_ in game_ids]
+        for bg in self.BG_IMAGE_NAMES:
+            links = {id_: self.BG_IMAGE_HOST.format(game_id=id_, bg=bg) for id_ in pending}
+            cached = self.cache.table(self.CACHE_LINKS_TABLE) if use_cache else {}
+            hits = sum(link in cached for link in links.values())
+            metrics.incr("steam.links_cache.hits", hits)
+            metrics.incr("steam.links_cache.misses", len(links) - hits)
+            probed = self.prober.probe_many([link for link in links.values() if link not in cached]) if probe else {}
+            for link, valid in probed.items():
+                if valid is None:
+                    metrics.incr("steam.links.probe_errors")
+                    continue  # probed again by the next run
+                self.cache.put(self.CACHE_LINKS_TABLE, link, valid)
+            pending = []
+            for id_, link in links.items():
+                valid = probed[link] if link in probed else cached.get(link)
+                if valid:
+                    bg_images[id_] = link
+                    continue
+                if link in probed and valid is None:
+                    unknown.add(id_)
+                pending.append(id_)
+        return bg_images, unknown
 
     @staticmethod
     def _playtime_format(playtime_in_minutes: int) -> str:
@@ -105,71 +277,188 @@ class SteamGamesLibrary(GamesLibrary):
             return f"{playtime_in_minutes} minutes"
         return f"{playtime_in_minutes // 60} hours"
 
+    @metrics.timed("steam.cache_game")
     def _cache_game(self, game_info: GameInfo):
-        g = load_from_file(self.CACHE_GAME_FILE)
-        g[str(game_info.id)] = game_info.to_dict()
-        dump_to_file(g, self.CACHE_GAME_FILE)
-
-    def _load_cached_games(self, skip_free_games: bool = False):
-        g = load_from_file(self.CACHE_GAME_FILE)
-        for id_, game_dict in g.items():
-            game_info = GameInfo(**game_dict)
-            if skip_free_games and game_info.free:
-                continue
-            self._games[id_] = game_info
-
-    def _fetch_library_games(self, skip_non_steam: bool = False, skip_free_games: bool = False, library_only: bool = False, no_cache: bool = False, force: bool = False):
-        if force or not self._games:
-            if not no_cache:
-                self._load_cached_games(skip_free_games=skip_free_games)
-            try:
-                number_of_games = len(self.user.games)
-                for i, g in enumerate(sorted(self.user.games, key=lambda x: x.name)):
-                    game_id = str(g.id)
-                    if game_id in self._games:
+        self.cache.put(self.CACHE_GAMES_TABLE, str(game_info.id), game_info.to_dict())
+
+    def _cache_library_game(self, game_info: GameInfo):
+        self.cache.put(self.CACHE_LIBRARY_GAMES_TABLE, str(game_info.id), game_info.to_dict())
+
+    def _load_cached_games(self, library_only: bool = False) -> GameCollection:
+        """ Load cached games, games without store data are used only when store is not asked anyway """
+        records = self.cache.table(self.CACHE_GAMES_TABLE)
+        if library_only:
+            records = {**self.cache.table(self.CACHE_LIBRARY_GAMES_TABLE), **records}
+        return GameCollection.from_records(records.values())
+
+    def _get_owned_games(self, cached_only: bool = False) -> tp.List[OwnedGame]:
+        """ Get whole library, library is cached so the next run can skip Steam Web API completely """
+        if self._owned_games is None:
+            self._owned_games = self._load_owned_games(cached_only=cached_only)
+        return self._owned_games
+
+    def _load_owned_games(self, cached_only: bool = False) -> tp.List[OwnedGame]:
+        if cached_only:
+            rows = self.cache.get(self.CACHE_OWNED_GAMES_TABLE, self.steamid)
+            if rows is None:
+                raise SteamApiError(msg=f"Library of user {self.user_id} is not cached yet, run once without --cached-only")
+            return [OwnedGame(*row) for row in rows]
+        games = self._fetch_owned_games()
+        rows = [list(g) for g in games]
+        if rows != self.cache.get(self.CACHE_OWNED_GAMES_TABLE, self.steamid):
+            self.cache.put(self.CACHE_OWNED_GAMES_TABLE, self.steamid, rows)
+        return games
+
+    def owned_game_ids(self, cached_only: bool = False) -> tp.Set[str]:
+        """ Ids of the whole library, also of games skipped on import """
+        return {g.id for g in self._get_owned_games(cached_only=cached_only)}
+
+    def missing_game_ids(self) -> tp.Set[str]:
+        """ Library games without cached game info that may be in store, only these need store requests """
+        cached = self.cache.table(self.CACHE_GAMES_TABLE)
+        game_ids = {g.id for g in self._selected_games() if g.id not in cached}
+        return game_ids - self.catalog.not_in_store(game_ids) if self.catalog is not None else game_ids
+
+    def _selected_games(self, cached_only: bool = False) -> tp.List[OwnedGame]:
+        games = self._get_owned_games(cached_only=cached_only)
+        if self.selection is None:
+            return games
+        selected = self.selection.apply(games)
+        metrics.incr("steam.selection.excluded", len(games) - len(selected))
+        return selected
+
+    @metrics.timed("steam.owned_games")
+    def _fetch_owned_games(self) -> tp.List[OwnedGame]:
+        """ Fetch whole library with app info in one GetOwnedGames request """
+        try:
+            r = self.store.session.get(self.OWNED_GAMES_API, params={
+                "key": self.api_key,
+                "steamid": self.steamid,
+                "include_appinfo": 1,
+                "include_played_free_games": 1,
+                "format": "json",
+            }, timeout=30)
+        except requests.RequestException as e:
+            raise SteamApiError(error=e)
+        if not r.ok:
+            raise SteamApiError(msg=f"can't get owned games, code: {r.status_code}, text: {r.text}")
+        return [
+            OwnedGame(
+                id=str(g["appid"]),
+                name=g.get("name") or str(g["appid"]),
+                playtime_forever=g.get("playtime_forever", 0),
+                playtime_2weeks=g.get("playtime_2weeks", 0),
+                rtime_last_played=g.get("rtime_last_played", 0),
+                img_icon_url=g.get("img_icon_url") or None,
+                img_logo_url=g.get("img_logo_url") or None,
+            )
+            for g in r.json().get("response", {}).get("games", [])
+        ]
+
+    def _resolve_game(self, g: OwnedGame, progress: Progress, skip_non_steam: bool = False, library_only: bool = False, no_cache: bool = False, offline: bool = False) -> tp.Tuple[tp.Optional[GameInfo], bool, bool]:
+        """ Build game info from store and library, runs in worker thread. Returns game info, whether it came from store
+        and whether it is final and can be cached (background links were probed).
+        Offline games are built from cached store answers and links only, messages are printed through `progress`.
+        """
+        game_id = g.id
+        steam_game = None
+        if offline:
+            steam_game = self.store.get_cached_game_info(game_id)
+            if steam_game is None and skip_non_steam and (self.store.cache.peek(game_id) is not None or game_id in self._not_in_store):
+                self._store_skipped.append(game_id)
+                return None, False, False
+        elif not library_only:
+            # Fetch game info from steam store, unless app catalog marks it delisted
+            if game_id not in self._not_in_store:
+                steam_game = self.store.find_game_info(game_id, use_cache=not no_cache)
+
+            if steam_game is None and skip_non_steam:
+                progress.log(f"Game {g.name} id:{game_id} not found in Steam store, skip it", "magenta")
+                self._store_skipped.append(game_id)
+                return None, False, False
+
+            if steam_game is None:
+                progress.log(f"Game {g.name} id:{game_id} not found in Steam store, fetching details from library", "red")
+
+        logo_uri = None
+        if steam_game is not None and steam_game.header_image:
+            logo_uri = steam_game.header_image
+        elif g.img_logo_url:
+            logo_uri = self._image_link(game_id, g.img_logo_url)
+        bg_images, bg_unknown = self._get_bg_images([game_id], use_cache=not no_cache, probe=not offline)
+
+        game_info = GameInfo(
+            id=game_id,
+            name=g.name,
+            platforms=[PLATFORM],
+            release_date=normalize_date(steam_game.release_date.date) if steam_game is not None else None,
+            playtime=self._playtime_format(g.playtime_forever),
+            playtime_minutes=g.playtime_forever,
+            logo_uri=logo_uri,
+            bg_uri=bg_images.get(game_id),
+            icon_uri=self._image_link(game_id, g.img_icon_url) if g.img_icon_url else None,
+            free=steam_game.is_free if steam_game is not None else None,
+        )
+        return game_info, steam_game is not None, game_id not in bg_unknown
+
+    def iter_games(
+        self,
+        skip_non_steam: bool = False,
+        skip_free_games: bool = False,
+        library_only: bool = False,
+        no_cache: bool = False,
+        cached_only: bool = False,
+    ) -> tp.Iterator[GameInfo]:
+        """ Yield library games as soon as they are resolved: cached games first, then fetched ones in completion order.
+        With `cached_only` nothing is requested from Steam, games missing in cache are built from cached library only.
+        """
+        try:
+            games = sorted(self._selected_games(cached_only=cached_only), key=lambda x: x.name)
+            # games built without store data may be not in store, with skip_non_steam they go through _resolve_game checks
+            with_library_games = library_only or (cached_only and not skip_non_steam)
+            cached = GameCollection() if no_cache else self._load_cached_games(library_only=with_library_games)
+            # all cache lookups are done before any network work
+            missing_ids = {g.id for g in games}.difference(cached.ids)
+            metrics.incr("steam.games_cache.hits", len(games) - len(missing_ids))
+            metrics.incr("steam.games_cache.misses", len(missing_ids))
+            skipped = {cached.ids[i] for i in cached.where(free=True)} if skip_free_games else set()
+            missing = [g for g in games if g.id in missing_ids]
+            if self.catalog is not None and not library_only:
+                self._not_in_store = self.catalog.not_in_store(missing_ids)
+                metrics.incr("steam.catalog.not_in_store", len(self._not_in_store))
+            for g in games:
+                if g.id not in missing_ids and g.id not in skipped:
+                    game_info = cached.get(g.id)
+                    # playtime is the only library value that changes
+                    game_info.playtime_minutes = g.playtime_forever
+                    game_info.playtime = self._playtime_format(g.playtime_forever)
+                    yield game_info
+
+            if not library_only and not cached_only:
+                self.store.prefetch_not_found([g.id for g in missing if g.id not in self._not_in_store], use_cache=not no_cache)
+            progress = Progress("Fetching", total=len(missing))
+            resolve = partial(self._resolve_game, progress=progress, skip_non_steam=skip_non_steam, library_only=library_only, no_cache=no_cache, offline=cached_only)
+            # games are submitted in small windows, so closed generator does not leave the whole library queued,
+            # workers are stopped before the progress is closed
+            with progress, closing(map_unordered(resolve, missing, self.store.workers)) as results:
+                for g, future in results:
+                    progress.update(item=g.name)
+                    game_info, from_store, final = future.result()
+                    if game_info is None:
                         continue
-                    echo.c(" " * 100 + f"\rFetching [{i}/{number_of_games}]: {g.name}", end="\r")
-                    steam_game = None
-                    if not library_only:
-                        # Fetch game info from steam store
-                        try:
-                            steam_game = self.store.get_game_info(game_id)
-                        except SteamApiNotFoundError:
-                            pass
-
-                        if steam_game is None and skip_non_steam:
-                            echo.m(f"Game {g.name} id:{game_id} not found in Steam store, skip it")
-                            self._store_skipped.append(game_id)
-                            continue
-
-                        if steam_game is None:
-                            echo.r(f"Game {g.name} id:{game_id} not found in Steam store, fetching details from library")
-
-                    logo_uri = None
-                    if steam_game is not None and steam_game.header_image:
-                        logo_uri = steam_game.header_image
-                    elif getattr(g, "img_logo_url", None):
-                        logo_uri = self._image_link(game_id, g.img_logo_url)
-
-                    game_info = GameInfo(
-                        id=game_id,
-                        name=g.name,
-                        platforms=[PLATFORM],
-                        release_date=steam_game.release_date.date if steam_game is not None else None,
-                        playtime=self._playtime_format(g.playtime_forever) if getattr(g, "playtime_forever", None) is not None else None,
-                        playtime_minutes=g.playtime_forever if getattr(g, "playtime_forever", None) is not None else None,
-                        logo_uri=logo_uri,
-                        bg_uri=self._get_bg_image(game_id),
-                        icon_uri=self._image_link(game_id, g.img_icon_url) if getattr(g, "img_icon_url", None) is not None else None,
-                        free=steam_game.is_free if steam_game is not None else None,
-                    )
-                    if steam_game is not None:
+                    if from_store and final and not cached_only:
                         self._cache_game(game_info)
+                    elif final and not cached_only:
+                        self._cache_library_game(game_info)
                     if skip_free_games and game_info.free:
                         continue
-                    self._games[game_id] = game_info
-            except Exception as e:
-                raise SteamApiError(error=e)
+                    yield game_info
+        except Exception as e:
+            raise SteamApiError(error=e)
+
+    def _fetch_library_games(self, force: bool = False, **kwargs):
+        if force or not self._games:
+            self._games = {game_info.id: game_info for game_info in self.iter_games(**kwargs)}
 
     def get_games_list(self, **kwargs) -> tp.List[TGameID]:
         """ Get game ids from library """
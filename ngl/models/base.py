@@ -8,3 +8,37 @@ class BaseModel:
         if d is None:
             return None
         return cls(**d)
+
+
+class LazyModel:
+    """ Slotted read-only view over raw api dict, nested models are decoded on first attribute access """
+    __slots__ = ("_raw", "_decoded")
+    FIELDS = ()  # type: tp.Tuple[str, ...]  # plain values returned from raw dict as is
+    NESTED = {}  # type: tp.Dict[str, tp.Tuple[type, bool]]  # field -> (model, is list)
+
+    def __init__(self, raw: dict):
+        self._raw = raw
+        self._decoded = None
+
+    @classmethod
+    def load(cls, d: tp.Optional[dict]):
+        if d is None:
+            return None
+        return cls(d)
+
+    def __getattr__(self, name):
+        nested = self.NESTED.get(name)
+        if nested is None:
+            if name in self.FIELDS:
+                return self._raw.get(name)
+            raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+        if self._decoded is None:
+            self._decoded = {}
+        if name not in self._decoded:
+            model, many = nested
+            value = self._raw.get(name)
+            self._decoded[name] = [model.load(t) for t in value or []] if many else model.load(value)
+        return self._decoded[name]
+
+    def to_dict(self) -> dict:
+        return self._raw
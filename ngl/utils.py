@@ -1,8 +1,9 @@
 import json
 import os
 import sys
+import threading
 import time
-from functools import wraps
+import typing as tp
 
 from termcolor import colored
 
@@ -46,10 +47,17 @@ class Echo:
     def _colored(msg, color):
         return colored(msg, color)
 
+    @staticmethod
+    def _flush(**kwargs):
+        # lines are flushed by the stream itself, only unfinished lines have to be pushed
+        if kwargs.get("end", "\n") != "\n":
+            kwargs.get("file", sys.stdout).flush()
+
     @staticmethod
     def _color_print(msg, color, **kwargs):
-        print(Echo._colored(msg, color=color), **kwargs)
-        sys.stdout.flush()
+        # one write per message, so lines printed by other threads do not get between message and its end
+        kwargs.get("file", sys.stdout).write(Echo._colored(msg, color=color) + kwargs.get("end", "\n"))
+        Echo._flush(**kwargs)
 
     @staticmethod
     def r(msg, **kwargs):
@@ -78,13 +86,95 @@ class Echo:
 
     def __call__(self, *args, **kwargs):
         print(*args, **kwargs)
-        sys.stdout.flush()
+        Echo._flush(**kwargs)
 
 
 echo = Echo()
 color = ColorText()
 
 
+class Progress:
+    """ Progress line safe to update from many threads
+
+    On terminal the line is redrawn at most `REFRESH_RATE` times per second,
+    when output is piped (CI logs) a summary line is printed every `LOG_INTERVAL` seconds instead.
+    """
+    REFRESH_RATE = 10
+    LOG_INTERVAL = 10
+
+    def __init__(self, title: str, total: tp.Optional[int] = None, color: str = "cyan", stream: tp.Optional[tp.TextIO] = None):
+        self.title = title
+        self.total = total
+        self.color = color
+        self.stream = stream or sys.stdout
+        self.done = 0
+        self.item = None  # type: tp.Optional[str]
+        self.tty = self.stream.isatty()
+        self.started = time.monotonic()
+        self._drawn = 0.0
+        self._drawn_done = 0
+        self._width = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def update(self, n: int = 1, item: tp.Optional[str] = None):
+        """ Count `n` more done items, `item` is shown on terminal as the current one """
+        with self._lock:
+            self.done += n
+            self.item = item
+            now = time.monotonic()
+            if now - self._drawn >= (1 / self.REFRESH_RATE if self.tty else self.LOG_INTERVAL):
+                self._drawn = now
+                self._draw()
+
+    def log(self, msg: str, color: tp.Optional[str] = None):
+        """ Print message line from any thread, on terminal the progress line is cleared and drawn again below it """
+        with self._lock:
+            line = colored(msg, color) if color else msg
+            if self.tty:
+                self.stream.write(" " * self._width + "\r" + line + "\n")
+                if self._width:
+                    self._draw()
+            else:
+                self.stream.write(line + "\n")
+            self.stream.flush()
+
+    def _line(self) -> str:
+        line = f"{self.title}: {self.done}/{self.total}" if self.total is not None else f"{self.title}: {self.done}"
+        if not self.tty:
+            elapsed = time.monotonic() - self.started
+            return line + f" ({self.done / elapsed if elapsed else 0:.1f}/s)"
+        return line + f" {self.item}" if self.item else line
+
+    def _draw(self):
+        self._drawn_done = self.done
+        line = self._line()
+        if self.tty:
+            # pad with spaces to clean previous longer line, cursor is left at line start for other messages
+            self.stream.write(colored(line.ljust(self._width), self.color) + "\r")
+            self._width = len(line)
+        else:
+            self.stream.write(line + "\n")
+        self.stream.flush()
+
+    def close(self):
+        """ Draw final state """
+        with self._lock:
+            if not self.done:
+                return
+            self.item = None
+            if self.tty or self._drawn_done != self.done:
+                self._draw()
+            if self.tty:
+                self.stream.write("\n")
+                self.stream.flush()
+
+
 def soft_exit(exit_code):
     if sys.platform == "win32":
         input(color.y("\nEnter any key to exit"))
@@ -102,37 +192,3 @@ def dump_to_file(d, filename):
     with open(filename, 'w') as f:
         json.dump(d, f)
 
-
-def retry(exceptions, on_code=None, retry_num=3, initial_wait=0.5, backoff=2, raise_on_error=True, debug_msg=None, debug=False):
-    def decorator(f):
-        @wraps(f)
-        def wrapper(*args, **kwargs):
-            _tries, _delay = retry_num + 1, initial_wait
-            while _tries > 1:
-                try:
-                    return f(*args, **kwargs)
-                except exceptions as e:
-                    if on_code is not None and on_code != e.code:
-                        if raise_on_error:
-                            raise
-                        return None
-                    _tries -= 1
-                    if _tries == 1:
-                        if raise_on_error:
-                            raise
-                        return None
-                    _delay *= backoff
-                    if debug:
-                        print_args = args if args else ""
-                        msg = str(
-                            f"Function: {f.__name__} args: {print_args}, kwargs: {kwargs}\n"
-                            f"Exception: {e}\n"
-                        ) if debug_msg is None else color.m(debug_msg)
-                        echo.m("\n" + msg)
-                        for s in range(_delay, 1, -1):
-                            echo.m(" " * 20 + f"\rWait for {s} seconds!", end="\r")
-                            time.sleep(1)
-                    else:
-                        time.sleep(_delay)
-        return wrapper
-    return decorator